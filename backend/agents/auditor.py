@@ -5,7 +5,6 @@ Uses deterministic checks first, then LLM for narrative assessment.
 """
 
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 from pathlib import Path
 
 from openpyxl import load_workbook
@@ -17,7 +16,7 @@ from config import (
     PUBLICATION_READY_THRESHOLD, THESIS_READY_THRESHOLD, NEEDS_REVISION_THRESHOLD
 )
 from utils.prompts import AUDITOR_SYSTEM_PROMPT
-from graph.state import SurveyAnalysisState, LogEntry
+from graph.state import SurveyAnalysisState, LogEntry, QCDecision, now_iso
 
 
 def run_deterministic_audit(
@@ -25,7 +24,7 @@ def run_deterministic_audit(
     sheets_created: List[str],
     formulas_documented: List[Dict],
     tasks_total: int,
-    qc_history: List[Dict]
+    qc_history: List[QCDecision]
 ) -> Dict[str, Any]:
     """
     Run deterministic audit checks on the workbook.
@@ -96,7 +95,7 @@ def run_deterministic_audit(
     metrics["formula_count"] = max(metrics["formula_count"], len(formulas_documented))
     
     if qc_history:
-        approvals = sum(1 for q in qc_history if q.get('decision') == 'APPROVE')
+        approvals = sum(1 for q in qc_history if q.decision == 'APPROVE')
         metrics["qc_approval_rate"] = (approvals / len(qc_history)) * 100
     
     if tasks_total > 0:
@@ -251,8 +250,8 @@ async def auditor_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     )
     
     tasks_completed = sum(1 for t in state['tasks'] if t.get('status') == 'completed')
-    qc_approvals = sum(1 for q in qc_history if q.get('decision') == 'APPROVE')
-    qc_rejections = sum(1 for q in qc_history if q.get('decision') == 'REJECT')
+    qc_approvals = sum(1 for q in qc_history if q.decision == 'APPROVE')
+    qc_rejections = sum(1 for q in qc_history if q.decision == 'REJECT')
     
     prompt = f"""Conduct the FINAL ACADEMIC AUDIT of this PhD-level survey analysis:
 
@@ -358,7 +357,7 @@ LLM NARRATIVE ASSESSMENT:
 """
     
     log_entry = LogEntry(
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         agent="auditor",
         action="Final Audit Complete",
         details=f"Overall Score: {overall_score:.1f}%, Certification: {certification}",
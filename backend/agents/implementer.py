@@ -5,13 +5,13 @@ Creates macro-enabled workbooks dynamically (no fixed template).
 Supports quantitative, qualitative, and reporting tasks.
 """
 
+import asyncio
 from pathlib import Path
 from typing import Dict, Any, List
-from datetime import datetime
 
 import pandas as pd
 
-from graph.state import SurveyAnalysisState, LogEntry
+from graph.state import SurveyAnalysisState, LogEntry, now_iso
 from engines.formula_engine import FormulaEngine
 from models.task_schema import TaskSpec, TaskType
 from tools.excel_template import ensure_macro_workbook, ExcelTemplateLoader
@@ -22,6 +22,7 @@ from tools.qual_tools import (
     generate_frequency_table
 )
 from tools.reporting import APATableWriter
+from tools.survey_loader import load_survey_dataframe
 from config import OUTPUT_DIR
 
 
@@ -394,7 +395,7 @@ async def implementer_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     current_task = TaskSpec.model_validate(tasks[current_idx])
 
     file_path = Path(state['file_path'])
-    df = pd.read_excel(file_path)
+    df = await asyncio.to_thread(load_survey_dataframe, file_path)
 
     session_id = state['session_id']
     workbook_path = OUTPUT_DIR / f"PhD_EDA_{session_id}.xlsm"
@@ -406,11 +407,10 @@ async def implementer_node(state: SurveyAnalysisState) -> Dict[str, Any]:
         session_id=session_id
     )
 
-    sheets_created = state.get('sheets_created', [])
-    sheets_created.append(excel_result['sheet_name'])
-
-    formulas_documented = state.get('formulas_documented', [])
-    formulas_documented.extend(excel_result['formulas'])
+    # Never mutate state lists in place; formulas_documented is reducer-backed,
+    # so only this task's formulas are returned and the reducer appends them.
+    sheets_created = [*state.get('sheets_created', []), excel_result['sheet_name']]
+    formulas_documented = list(excel_result['formulas'])
 
     task_output = f"""
 TASK COMPLETED: {current_task.id} - {current_task.name}
@@ -437,7 +437,7 @@ FORMULAS WRITTEN ({len(excel_result['formulas'])}):
     updated_tasks[current_idx] = updated_task
 
     log_entry = LogEntry(
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         agent="implementer",
         action=f"Executed task {current_task.id} deterministically",
         details=f"Created sheet: {excel_result['sheet_name']}, Formulas: {len(excel_result['formulas'])}",
@@ -9,9 +9,9 @@ Architecture:
 Reviews the ACTUAL Excel file, not just text reports.
 """
 
+import asyncio
 from pathlib import Path
 from typing import Dict, Any, List
-from datetime import datetime
 import re
 
 import pandas as pd
@@ -28,9 +28,10 @@ from config import (
     ANTHROPIC_API_KEY, OPENAI_API_KEY
 )
 from utils.prompts import QC_REVIEWER_SYSTEM_PROMPT
-from graph.state import SurveyAnalysisState, QCDecision, LogEntry
+from graph.state import SurveyAnalysisState, QCDecision, LogEntry, now_iso
 from engines.qc_engine import run_deterministic_qc
 from models.task_schema import TaskSpec, TaskType
+from tools.survey_loader import load_survey_dataframe
 
 
 def verify_excel_file(workbook_path: str, sheet_name: str) -> Dict[str, Any]:
@@ -283,9 +284,10 @@ async def qc_reviewer_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     else:
         sheet_name = task_spec.output_sheet
 
-    excel_verification = verify_excel_file(workbook_path, sheet_name)
-
-    raw_df = pd.read_excel(state['file_path'])
+    excel_verification, raw_df = await asyncio.gather(
+        asyncio.to_thread(verify_excel_file, workbook_path, sheet_name),
+        asyncio.to_thread(load_survey_dataframe, Path(state['file_path'])),
+    )
     cleaned_df = clean_dataframe_for_verification(raw_df)
     verification_config = build_verification_config(task_spec, state)
 
@@ -319,7 +321,7 @@ Fix these issues before resubmitting.
             "formula_coverage": deterministic_result.get("metrics", {}).get("formula_percentage", 0),
             "task_revision_count": revision_count + 1,
             "execution_log": [LogEntry(
-                timestamp=datetime.now().isoformat(),
+                timestamp=now_iso(),
                 agent="qc_reviewer",
                 action=f"Deterministic QC failed for task {task_spec.id}",
                 details=f"Errors: {deterministic_errors}",
@@ -343,10 +345,6 @@ Fix these issues before resubmitting.
         api_key=ANTHROPIC_API_KEY
     )
 
-    response_sonnet = await llm_sonnet.ainvoke(messages)
-    review_sonnet = response_sonnet.content
-    decision_sonnet = parse_decision(review_sonnet)
-
     llm_openai = ChatOpenAI(
         model=QC_REVIEWER_MODEL_2,
         temperature=QC_REVIEWER_TEMP,
@@ -354,7 +352,15 @@ Fix these issues before resubmitting.
         api_key=OPENAI_API_KEY
     )
 
-    response_openai = await llm_openai.ainvoke(messages)
+    # The two reviews are independent, so run them concurrently
+    response_sonnet, response_openai = await asyncio.gather(
+        llm_sonnet.ainvoke(messages),
+        llm_openai.ainvoke(messages)
+    )
+
+    review_sonnet = response_sonnet.content
+    decision_sonnet = parse_decision(review_sonnet)
+
     review_openai = response_openai.content
     decision_openai = parse_decision(review_openai)
 
@@ -399,12 +405,12 @@ FINAL DECISION: {final_decision}
             "sonnet_decision": decision_sonnet,
             "openai_decision": decision_openai
         },
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         revision_number=revision_count + 1
     )
 
     log_entry = LogEntry(
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         agent="qc_reviewer",
         action=f"Dual review of task {task_spec.id}",
         details=f"Sonnet: {decision_sonnet}, OpenAI: {decision_openai} -> Final: {final_decision}",
@@ -7,14 +7,13 @@ Outputs JSON that matches the task schema.
 import json
 import re
 from typing import Dict, List, Any, Optional
-from datetime import datetime
 
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from config import STRATEGIST_MODEL, STRATEGIST_TEMP, STRATEGIST_MAX_TOKENS, ANTHROPIC_API_KEY, STRATEGIST_PROVIDER
 from utils.prompts import STRATEGIST_SYSTEM_PROMPT
-from graph.state import SurveyAnalysisState, LogEntry
+from graph.state import SurveyAnalysisState, LogEntry, now_iso
 from models.task_schema import MasterPlan, TaskSpec, TaskType, TaskPhase
 
 
@@ -189,7 +188,7 @@ Column letters start at A for the first column."""
         tasks.append(td)
 
     log_entry = LogEntry(
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         agent="strategist",
         action="Created Master Plan",
         details=f"Generated {len(tasks)} tasks across phases",
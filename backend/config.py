@@ -57,6 +57,15 @@ NEEDS_REVISION_THRESHOLD = 90.0
 MAX_TASK_REVISIONS = 10  # Max revisions per task before escalation
 MAX_PLAN_REVISIONS = 3   # Max plan revisions
 
+# Workflow checkpoints kept in memory (least recently active sessions are evicted)
+MAX_CHECKPOINT_SESSIONS = int(os.getenv("MAX_CHECKPOINT_SESSIONS", "50"))
+
+# API sessions kept in memory (oldest finished sessions are evicted first)
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "200"))
+
+# Analysis workflows allowed to run at once; further requests wait as "queued"
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "4"))
+
 # Excel recalculation (required for UDF verification)
 REQUIRE_EXCEL_RECALC = os.getenv("REQUIRE_EXCEL_RECALC", "1") == "1"
 
@@ -4,7 +4,7 @@ Generates Excel formulas programmatically by task type.
 No LLM involvement - pure template-based generation.
 """
 
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Callable, Dict, List, Any, Tuple, Optional
 from pathlib import Path
 from datetime import datetime
 
@@ -16,6 +16,46 @@ from openpyxl.styles import Font, Border, Side, PatternFill
 
 from models.task_schema import TaskType, TaskSpec
 from tools.excel_template import ensure_macro_workbook
+from tools.excel_tools import COLUMN_LETTERS
+
+
+# Shared (immutable) styles; colors are full ARGB so the fill is opaque
+HEADER_FONT = Font(bold=True)
+HEADER_FILL = PatternFill(start_color="FFDAEEF3", end_color="FFDAEEF3", fill_type="solid")
+TITLE_FONT = Font(bold=True, size=14)
+NOTE_FONT = Font(italic=True)
+_THIN = Side(style='thin', color='FF000000')
+THIN_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+# Descriptive statistics sheet: (output column, formula template, purpose);
+# {r} is the column's data range
+DESCRIPTIVE_TEMPLATES = (
+    (2, "=COUNT({r})", "N"),
+    (3, "=ROUND(AVERAGE({r}),3)", "Mean"),
+    (4, "=ROUND(STDEV.S({r}),3)", "SD"),
+    (5, "=ROUND(STDEV.S({r})/SQRT(COUNT({r})),4)", "SE"),
+    (6, "=ROUND(MEDIAN({r}),3)", "Median"),
+    (7, "=MIN({r})", "Min"),
+    (8, "=MAX({r})", "Max"),
+    (9, "=MAX({r})-MIN({r})", "Range"),
+    (10, "=ROUND(SKEW({r}),3)", "Skewness"),
+    (11, "=ROUND(KURT({r}),3)", "Kurtosis"),
+)
+
+
+def _quote_criteria(value: Any) -> str:
+    text = str(value).replace('"', '""')
+    return f"\"{text}\""
+
+
+# COUNTIF/COUNTIFS criteria formatting keyed on exact builtin type; other
+# types (numpy scalars, None, NaT, ...) take the general path
+_CRITERIA_FORMATTERS: Dict[type, Callable[[Any], str]] = {
+    str: _quote_criteria,
+    bool: lambda v: "TRUE" if v else "FALSE",
+    int: str,
+    float: lambda v: "\"\"" if v != v else str(v),
+}
 
 
 class FormulaEngine:
@@ -35,22 +75,19 @@ class FormulaEngine:
         self.data_sheet = self.raw_sheet
 
         # Build column mapping: column_name -> Excel letter
-        self.col_mapping: Dict[str, str] = {}
-        for i, col in enumerate(df.columns):
-            self.col_mapping[col] = get_column_letter(i + 1)
+        self.col_mapping: Dict[str, str] = dict(zip(df.columns, COLUMN_LETTERS))
+        # Per-sheet column data ranges, built on first use of each sheet
+        self._range_cache: Dict[str, Dict[str, str]] = {}
+        # (sheet, column) -> [(output column, letter, formula, purpose)]
+        self._descriptive_cache: Dict[Tuple[str, str], List[Tuple[int, str, str, str]]] = {}
 
         # Identify column types
         self.cleaned_df, self.numeric_cols, self.categorical_cols = self._clean_dataframe(df)
 
         # Styles
-        self.header_font = Font(bold=True)
-        self.header_fill = PatternFill(start_color="DAEEF3", end_color="DAEEF3", fill_type="solid")
-        self.thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        self.header_font = HEADER_FONT
+        self.header_fill = HEADER_FILL
+        self.thin_border = THIN_BORDER
 
     def _clean_dataframe(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str], List[str]]:
         """
@@ -90,19 +127,19 @@ class FormulaEngine:
 
     def _format_criteria(self, value: Any) -> str:
         """Format Excel criteria for COUNTIF/COUNTIFS based on value type."""
+        formatter = _CRITERIA_FORMATTERS.get(type(value))
+        if formatter is not None:
+            return formatter(value)
+
         try:
             if pd.isna(value):
                 return "\"\""
         except Exception:
             pass
 
-        if isinstance(value, bool):
-            return "TRUE" if value else "FALSE"
-        if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if isinstance(value, (int, float)):
             return str(value)
-
-        text = str(value).replace('"', '""')
-        return f"\"{text}\""
+        return _quote_criteria(value)
 
     def _row_count_formula(self, sheet_name: str) -> str:
         """Return a formula to estimate total data rows across all columns."""
@@ -166,15 +203,28 @@ class FormulaEngine:
         for i, col in enumerate(self.df.columns, 1):
             ws.cell(row=1, column=i, value=col)
 
+        # Mean/SD are materialized once per column in hidden rows below the
+        # data, so each z-score cell references them instead of re-aggregating
+        # the whole column (O(n) rather than O(n^2) work on recalculation).
+        mean_row = self.n_rows + 3
+        sd_row = mean_row + 1
+        for col_idx, col_name in enumerate(self.df.columns, 1):
+            if col_name not in self.numeric_cols:
+                continue
+            data_range = self._get_data_range(col_name, self.clean_sheet)
+            ws.cell(row=mean_row, column=col_idx, value=f"=AVERAGE({data_range})")
+            ws.cell(row=sd_row, column=col_idx, value=f"=STDEV.S({data_range})")
+        ws.row_dimensions[mean_row].hidden = True
+        ws.row_dimensions[sd_row].hidden = True
+
         for row_idx in range(2, self.n_rows + 2):
             for col_idx, col_name in enumerate(self.df.columns, 1):
                 col_letter = self.col_mapping[col_name]
                 clean_cell = f"'{self.clean_sheet}'!{col_letter}{row_idx}"
-                data_range = f"'{self.clean_sheet}'!{col_letter}2:{col_letter}{self.n_rows + 1}"
                 if col_name in self.numeric_cols:
                     formula = (
                         f'=IF({clean_cell}="","",'
-                        f'IFERROR(({clean_cell}-AVERAGE({data_range}))/STDEV.S({data_range}),""))'
+                        f'IFERROR(({clean_cell}-${col_letter}${mean_row})/${col_letter}${sd_row},""))'
                     )
                 else:
                     formula = f"={clean_cell}"
@@ -260,11 +310,30 @@ class FormulaEngine:
 
     def _get_data_range(self, col_name: str, sheet_name: Optional[str] = None) -> str:
         """Get Excel range reference for a column's data."""
-        col_letter = self.col_mapping.get(col_name)
-        if not col_letter:
-            raise ValueError(f"Column '{col_name}' not found")
         sheet = sheet_name or self.data_sheet
-        return f"'{sheet}'!{col_letter}2:{col_letter}{self.n_rows + 1}"
+        ranges = self._range_cache.get(sheet)
+        if ranges is None:
+            last_row = self.n_rows + 1
+            ranges = self._range_cache[sheet] = {
+                col: f"'{sheet}'!{letter}2:{letter}{last_row}"
+                for col, letter in self.col_mapping.items()
+            }
+        data_range = ranges.get(col_name)
+        if data_range is None:
+            raise ValueError(f"Column '{col_name}' not found")
+        return data_range
+
+    def _descriptive_formulas(self, col_name: str) -> List[Tuple[int, str, str, str]]:
+        """Descriptive statistics formulas for a column on the current data sheet."""
+        key = (self.data_sheet, col_name)
+        cached = self._descriptive_cache.get(key)
+        if cached is None:
+            data_range = self._get_data_range(col_name)
+            cached = self._descriptive_cache[key] = [
+                (col_idx, COLUMN_LETTERS[col_idx - 1], template.format(r=data_range), f"{col_name} {purpose}")
+                for col_idx, template, purpose in DESCRIPTIVE_TEMPLATES
+            ]
+        return cached
 
     def _open_workbook(self) -> Workbook:
         """Open or create macro-enabled workbook and ensure data sheets exist."""
@@ -289,7 +358,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "DATA AUDIT TRAIL"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
         ws['A3'] = "Session ID:"
         ws['B3'] = self.session_id
         ws['A4'] = "Analysis Date:"
@@ -345,7 +414,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "DATA DICTIONARY"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
         ws['A2'] = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
 
         headers = ["Variable", "Column", "Type", "Level", "N Valid", "N Missing",
@@ -424,7 +493,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "MISSING DATA ANALYSIS"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         headers = ["Variable", "N Total", "N Missing", "% Missing", "Pattern"]
         for i, h in enumerate(headers, 1):
@@ -476,7 +545,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "DESCRIPTIVE STATISTICS"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         headers = ["Variable", "N", "Mean", "SD", "SE", "Median", "Min", "Max", "Range", "Skewness", "Kurtosis"]
         for i, h in enumerate(headers, 1):
@@ -493,29 +562,14 @@ class FormulaEngine:
             if col_name not in self.numeric_cols:
                 continue
 
-            data_range = self._get_data_range(col_name)
-
             ws.cell(row=row, column=1, value=col_name)
 
-            stats_formulas = [
-                (2, f"=COUNT({data_range})", "N"),
-                (3, f"=ROUND(AVERAGE({data_range}),3)", "Mean"),
-                (4, f"=ROUND(STDEV.S({data_range}),3)", "SD"),
-                (5, f"=ROUND(STDEV.S({data_range})/SQRT(COUNT({data_range})),4)", "SE"),
-                (6, f"=ROUND(MEDIAN({data_range}),3)", "Median"),
-                (7, f"=MIN({data_range})", "Min"),
-                (8, f"=MAX({data_range})", "Max"),
-                (9, f"=MAX({data_range})-MIN({data_range})", "Range"),
-                (10, f"=ROUND(SKEW({data_range}),3)", "Skewness"),
-                (11, f"=ROUND(KURT({data_range}),3)", "Kurtosis"),
-            ]
-
-            for col_idx, formula, purpose in stats_formulas:
+            for col_idx, col_letter, formula, purpose in self._descriptive_formulas(col_name):
                 ws.cell(row=row, column=col_idx, value=formula)
                 formulas.append({
-                    "cell": f"{get_column_letter(col_idx)}{row}",
+                    "cell": f"{col_letter}{row}",
                     "formula": formula,
-                    "purpose": f"{col_name} {purpose}"
+                    "purpose": purpose
                 })
 
             row += 1
@@ -537,7 +591,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "FREQUENCY TABLES"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         cols_to_use = task.columns.column_names if task.columns.column_names else self.categorical_cols
         if task.columns.max_columns:
@@ -595,9 +649,9 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "NORMALITY DIAGNOSTICS"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
         ws['A2'] = "Note: Shapiro-Wilk uses UDF SHAPIRO_WILK(). Skew/Kurt provided as supplemental."
-        ws['A2'].font = Font(italic=True)
+        ws['A2'].font = NOTE_FONT
 
         headers = ["Variable", "N", "Shapiro W", "Shapiro p", "Skewness", "Kurtosis", "Z Skew", "Z Kurt", "Assessment"]
         for i, h in enumerate(headers, 1):
@@ -653,12 +707,16 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "CORRELATION MATRIX (Pearson r)"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         cols_to_use = task.columns.column_names if task.columns.column_names else self.numeric_cols
         if task.columns.max_columns:
             cols_to_use = cols_to_use[:task.columns.max_columns]
         cols_to_use = [c for c in cols_to_use if c in self.numeric_cols]
+        # CORREL is #DIV/0! for a zero-variance column; write N/A instead of a
+        # formula Excel would re-evaluate on every recalculation
+        n_unique = self.cleaned_df[cols_to_use].nunique()
+        constant_cols = set(n_unique.index[n_unique <= 1])
 
         for i, col in enumerate(cols_to_use, 2):
             ws.cell(row=3, column=i, value=col[:10])
@@ -675,6 +733,10 @@ class FormulaEngine:
                 if i == j:
                     ws.cell(row=row, column=col, value="=1")
                     formulas.append({"cell": f"{get_column_letter(col)}{row}", "formula": "=1", "purpose": "Diagonal"})
+                elif i < j and (row_col in constant_cols or col_col in constant_cols):
+                    formula = '="N/A"'
+                    ws.cell(row=row, column=col, value=formula)
+                    formulas.append({"cell": f"{get_column_letter(col)}{row}", "formula": formula, "purpose": f"r({row_col},{col_col}) constant"})
                 elif i < j:
                     range1 = self._get_data_range(row_col)
                     range2 = self._get_data_range(col_col)
@@ -704,7 +766,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "RELIABILITY ANALYSIS (Cronbach's Alpha)"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         items = task.scale_items if task.scale_items else self.numeric_cols
         items = [i for i in items if i in self.col_mapping]
@@ -825,7 +887,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "GROUP COMPARISON ANALYSIS"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         group_var = task.group_by
         if not group_var or group_var not in self.df.columns:
@@ -929,7 +991,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "CROSS-TABULATION"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         cols = task.columns.column_names if task.columns.column_names else self.categorical_cols
         row_var = None
@@ -1061,7 +1123,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "EFFECT SIZE CALCULATIONS"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         ws['A3'] = "Cohen's d Interpretation:"
         ws['A4'] = "Small: |d| ~ 0.2"
@@ -1182,7 +1244,7 @@ class FormulaEngine:
         formulas = []
 
         ws['A1'] = "ANALYSIS SUMMARY DASHBOARD"
-        ws['A1'].font = Font(bold=True, size=14)
+        ws['A1'].font = TITLE_FONT
 
         ws['A3'] = "Dataset Overview"
         ws['A3'].font = self.header_font
@@ -7,7 +7,9 @@ Integrates statistical verification for ground-truth comparison.
 from typing import Dict, List, Any, Tuple, Optional
 from pathlib import Path
 from openpyxl import load_workbook
+from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.utils import get_column_letter
+import io
 import re
 
 import pandas as pd
@@ -204,27 +206,26 @@ class DeterministicQC:
             correct_references = 0
             incorrect_references = []
             
-            for row in ws.iter_rows(min_row=1, max_row=min(50, ws.max_row or 1)):
-                for cell in row:
-                    if isinstance(cell.value, str) and cell.value.startswith("="):
-                        formulas_checked += 1
-                        formula = cell.value
-                        
-                        # Check if formula references raw data sheet
-                        if self.RAW_DATA_SHEET in formula or "'" not in formula:
-                            correct_references += 1
-                        elif re.search(r"'[^']+'\!", formula):
-                            # References another sheet - check if it's valid
-                            sheet_refs = re.findall(r"'([^']+)'\!", formula)
-                            for ref in sheet_refs:
-                                if ref not in wb.sheetnames and ref != self.RAW_DATA_SHEET:
-                                    incorrect_references.append({
-                                        "cell": f"{get_column_letter(cell.column)}{cell.row}",
-                                        "formula": formula[:50],
-                                        "invalid_ref": ref
-                                    })
-                        else:
-                            correct_references += 1
+            for row, col, value in self._scan_cells(ws, max_row=50):
+                if isinstance(value, str) and value.startswith("="):
+                    formulas_checked += 1
+                    formula = value
+                    
+                    # Check if formula references raw data sheet
+                    if self.RAW_DATA_SHEET in formula or "'" not in formula:
+                        correct_references += 1
+                    elif re.search(r"'[^']+'\!", formula):
+                        # References another sheet - check if it's valid
+                        sheet_refs = re.findall(r"'([^']+)'\!", formula)
+                        for ref in sheet_refs:
+                            if ref not in wb.sheetnames and ref != self.RAW_DATA_SHEET:
+                                incorrect_references.append({
+                                    "cell": f"{get_column_letter(col)}{row}",
+                                    "formula": formula[:50],
+                                    "invalid_ref": ref
+                                })
+                    else:
+                        correct_references += 1
             
             wb.close()
             
@@ -311,13 +312,12 @@ class DeterministicQC:
             error_patterns = ['#REF!', '#DIV/0!', '#VALUE!', '#NAME?', '#N/A', '#NULL!', '#NUM!']
             errors_found = []
             
-            for row in ws.iter_rows(min_row=1, max_row=min(100, ws.max_row or 1)):
-                for cell in row:
-                    if cell.value and str(cell.value) in error_patterns:
-                        errors_found.append({
-                            "cell": f"{get_column_letter(cell.column)}{cell.row}",
-                            "error": str(cell.value)
-                        })
+            for row, col, value in self._scan_cells(ws, max_row=100):
+                if value and str(value) in error_patterns:
+                    errors_found.append({
+                        "cell": f"{get_column_letter(col)}{row}",
+                        "error": str(value)
+                    })
             
             wb.close()
             
@@ -335,6 +335,22 @@ class DeterministicQC:
             self.warnings.append(f"Could not check for Excel errors: {str(e)}")
             return True
     
+    @staticmethod
+    def _scan_cells(ws: Worksheet, max_row: int) -> List[Tuple[int, int, Any]]:
+        """
+        Collect (row, column, value) for every non-empty cell in the first max_row rows.
+        Shared by the reference and error checks so each sheet is walked once per mode.
+        """
+        bounded_row = min(max_row, ws.max_row or 1)
+        return [
+            (row_idx, col_idx, value)
+            for row_idx, row in enumerate(
+                ws.iter_rows(min_row=1, max_row=bounded_row, values_only=True), 1
+            )
+            for col_idx, value in enumerate(row, 1)
+            if value is not None
+        ]
+    
     def _build_result(self, passed: bool) -> Dict[str, Any]:
         """Build the final QC result dictionary."""
         return {
@@ -347,39 +363,39 @@ class DeterministicQC:
     
     def _generate_summary(self, passed: bool) -> str:
         """Generate human-readable summary."""
-        lines = [
-            "=" * 50,
-            "DETERMINISTIC QC RESULTS",
-            "=" * 50,
-            f"Status: {'PASSED' if passed else 'FAILED'}",
-            "",
-            "Metrics:"
-        ]
+        buf = io.StringIO()
+        w = buf.write
+        rule = "=" * 50 + "\n"
+        
+        w(rule)
+        w("DETERMINISTIC QC RESULTS\n")
+        w(rule)
+        w(f"Status: {'PASSED' if passed else 'FAILED'}\n")
+        w("\n")
+        w("Metrics:\n")
         
         if "formula_percentage" in self.metrics:
-            lines.append(f"  - Formula coverage: {self.metrics['formula_percentage']}%")
+            w(f"  - Formula coverage: {self.metrics['formula_percentage']}%\n")
         if "formula_cells" in self.metrics:
-            lines.append(f"  - Formula cells: {self.metrics['formula_cells']}")
+            w(f"  - Formula cells: {self.metrics['formula_cells']}\n")
         if "sample_formulas" in self.metrics and self.metrics["sample_formulas"]:
-            lines.append("  - Sample formulas:")
+            w("  - Sample formulas:\n")
             for f in self.metrics["sample_formulas"][:3]:
-                lines.append(f"    {f['cell']}: {f['formula'][:40]}...")
+                w(f"    {f['cell']}: {f['formula'][:40]}...\n")
         
         if self.errors:
-            lines.append("")
-            lines.append("Errors:")
+            w("\nErrors:\n")
             for e in self.errors:
-                lines.append(f"  FAIL: {e}")
+                w(f"  FAIL: {e}\n")
         
         if self.warnings:
-            lines.append("")
-            lines.append("Warnings:")
-            for w in self.warnings:
-                lines.append(f"  WARN: {w}")
+            w("\nWarnings:\n")
+            for warning in self.warnings:
+                w(f"  WARN: {warning}\n")
         
-        lines.append("=" * 50)
+        w("=" * 50)
         
-        return "\n".join(lines)
+        return buf.getvalue()
 
 
 def run_deterministic_qc(
@@ -415,9 +431,9 @@ def run_deterministic_qc(
             verification_config=verification_config
         )
         if not stat_passed:
+            # errors/metrics in result are qc's live lists, so only the
+            # verdict and the rendered summary need refreshing.
             result["passed"] = False
-            result["errors"] = qc.errors
-            result["metrics"] = qc.metrics
             result["summary"] = qc._generate_summary(False)
     
     return result
@@ -3,17 +3,45 @@ LangGraph workflow nodes for PhD Survey Analyzer.
 Each node represents a step in the multi-agent workflow.
 """
 
+import asyncio
 from pathlib import Path
 from typing import Dict, Any
 from datetime import datetime
 
-import pandas as pd
-from graph.state import SurveyAnalysisState, LogEntry
+from graph.state import SurveyAnalysisState, LogEntry, now_iso
 from tools.stats_tools import SurveyDataAnalyzer
-from tools.reporting import APATableWriter, generate_apa_interpretation
+from tools.survey_loader import load_survey_dataframe
 from config import OUTPUT_DIR
 
 
+AUDIT_CERTIFICATE_TEMPLATE = """{rule}
+# ACADEMIC AUDIT CERTIFICATE
+{rule}
+
+**Survey:** {file_name}
+**Session:** {session_id}
+**Date:** {timestamp}
+**Auditor:** Claude Opus 4.5 (Survey Auditor Agent)
+
+## QUALITY SCORES
+
+{scores_md}
+**OVERALL SCORE:** {overall:.1f}%
+
+## CERTIFICATION: {certification}
+
+---
+
+{audit_result}"""
+
+
+def _format_quality_score(name: str, value: Any) -> str:
+    """Render one quality score line for the audit certificate."""
+    score = float(value) if value is not None else 0.0
+    status = "PASS" if score >= 95 else "WARN" if score >= 90 else "FAIL"
+    return f"- **{name.replace('_', ' ').title()}:** {score:.1f}% {status}\n"
+
+
 async def load_data_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     """
     Load and analyze the survey Excel file.
@@ -26,7 +54,7 @@ async def load_data_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     """
     file_path = Path(state['file_path'])
     
-    df = pd.read_excel(file_path)
+    df = await asyncio.to_thread(load_survey_dataframe, file_path)
     
     analyzer = SurveyDataAnalyzer(df)
     
@@ -37,7 +65,7 @@ async def load_data_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     scales = analyzer.detect_scales()
     
     log_entry = LogEntry(
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         agent="system",
         action="Loaded survey data",
         details=f"Loaded {len(df)} rows x {len(df.columns)} columns",
@@ -78,7 +106,7 @@ async def advance_task_node(state: SurveyAnalysisState) -> Dict[str, Any]:
         updated_tasks[current_idx]['status'] = 'completed'
         
         log_entry = LogEntry(
-            timestamp=datetime.now().isoformat(),
+            timestamp=now_iso(),
             agent="system",
             action=f"Task {tasks[current_idx]['id']} completed",
             details="Moving to next task",
@@ -133,32 +161,28 @@ async def generate_deliverables_node(state: SurveyAnalysisState) -> Dict[str, An
         f.write("| Task | Decision | Revision # | Timestamp |\n")
         f.write("|------|----------|------------|----------|\n")
         for qc in state.get('qc_history', []):
-            f.write(f"| {qc.get('task_id', '')} | {qc.get('decision', '')} | {qc.get('revision_number', '')} | {qc.get('timestamp', '')} |\n")
+            f.write(f"| {qc.task_id} | {qc.decision} | {qc.revision_number} | {qc.timestamp} |\n")
     deliverables.append(str(qc_trail_path))
     
     audit_path = OUTPUT_DIR / f"AUDIT_CERTIFICATE_{session_id}.md"
+    quality_scores = state.get('quality_scores') or {}
+    if quality_scores:
+        scores_md = "".join(
+            _format_quality_score(k, v) for k, v in quality_scores.items()
+        )
+    else:
+        scores_md = "- Quality scores not yet available\n"
     with open(audit_path, "w", encoding="utf-8") as f:
-        f.write("=" * 60 + "\n")
-        f.write("# ACADEMIC AUDIT CERTIFICATE\n")
-        f.write("=" * 60 + "\n\n")
-        f.write(f"**Survey:** {file_name}\n")
-        f.write(f"**Session:** {session_id}\n")
-        f.write(f"**Date:** {timestamp}\n")
-        f.write(f"**Auditor:** Claude Opus 4.5 (Survey Auditor Agent)\n\n")
-        f.write("## QUALITY SCORES\n\n")
-        quality_scores = state.get('quality_scores') or {}
-        if quality_scores:
-            for k, v in quality_scores.items():
-                score = float(v) if v is not None else 0.0
-                status = "PASS" if score >= 95 else "WARN" if score >= 90 else "FAIL"
-                f.write(f"- **{k.replace('_', ' ').title()}:** {score:.1f}% {status}\n")
-        else:
-            f.write("- Quality scores not yet available\n")
-        overall = float(state.get('overall_score') or 0)
-        f.write(f"\n**OVERALL SCORE:** {overall:.1f}%\n")
-        f.write(f"\n## CERTIFICATION: {state.get('certification', 'PENDING')}\n\n")
-        f.write("---\n\n")
-        f.write(state.get('audit_result', ''))
+        f.write(AUDIT_CERTIFICATE_TEMPLATE.format_map({
+            "rule": "=" * 60,
+            "file_name": file_name,
+            "session_id": session_id,
+            "timestamp": timestamp,
+            "scores_md": scores_md,
+            "overall": float(state.get('overall_score') or 0),
+            "certification": state.get('certification', 'PENDING'),
+            "audit_result": state.get('audit_result', ''),
+        }))
     deliverables.append(str(audit_path))
     
     method_path = OUTPUT_DIR / f"METHODOLOGY_DOCUMENTATION_{session_id}.md"
@@ -196,7 +220,7 @@ async def generate_deliverables_node(state: SurveyAnalysisState) -> Dict[str, An
     deliverables.append(str(limits_path))
     
     log_entry = LogEntry(
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         agent="system",
         action="Generated deliverables",
         details=f"Created {len(deliverables)} deliverable files",
@@ -3,20 +3,60 @@ Plan Review Node.
 Deterministic validation of the master plan before execution begins.
 """
 
-from typing import Dict, Any
-from datetime import datetime
+import json
+import logging
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Any, Literal
 
-from graph.state import SurveyAnalysisState, LogEntry
+from pydantic import TypeAdapter
+
+from config import MAX_PLAN_REVISIONS
+from graph.state import SurveyAnalysisState, LogEntry, now_iso
 from models.task_schema import MasterPlan, PlanValidationResult, validate_plan
 
 
+logger = logging.getLogger(__name__)
+
+_PLAN_ADAPTER = TypeAdapter(MasterPlan)
+_REPORT_RULE = "=" * 60
+
+# Shared read-only result for plans with no tasks (skips model validation)
+_EMPTY_PLAN_RESULT = PlanValidationResult(
+    is_valid=False,
+    errors=["No tasks in plan"],
+    warnings=[],
+    task_count=0,
+    phase_coverage={}
+)
+
+
+@lru_cache(maxsize=32)
+def _validate_plan_json(plan_key: str) -> MasterPlan:
+    """Validate a canonical plan JSON string (cached across revision loops)."""
+    return _PLAN_ADAPTER.validate_json(plan_key)
+
+
+def _validate_plan_dict(plan_data: Dict[str, Any]) -> MasterPlan:
+    """
+    Validate plan data, skipping validation for plans already seen.
+    Callers get their own deep copy of the cached plan. Data that is not
+    plain JSON has no canonical key and is validated directly.
+    """
+    try:
+        plan_key = json.dumps(plan_data, sort_keys=True)
+    except (TypeError, ValueError):
+        return _PLAN_ADAPTER.validate_python(plan_data)
+    return _validate_plan_json(plan_key).model_copy(deep=True)
+
+
 def _coerce_plan_from_state(state: SurveyAnalysisState) -> MasterPlan:
     """Build MasterPlan from state (plan_json preferred)."""
     plan_json = state.get("plan_json") or {}
     if plan_json:
-        return MasterPlan.model_validate(plan_json)
+        return _validate_plan_dict(plan_json)
 
-    return MasterPlan.model_validate({
+    return _validate_plan_dict({
         "session_id": state.get("session_id", "unknown"),
         "total_variables": state.get("n_cols", 0),
         "total_observations": state.get("n_rows", 0),
@@ -28,35 +68,33 @@ def _coerce_plan_from_state(state: SurveyAnalysisState) -> MasterPlan:
 
 def build_validation_report(result: PlanValidationResult) -> str:
     """Create a human-readable plan review report."""
-    report_lines = [
-        "=" * 60,
-        "PLAN REVIEW GATE",
-        "=" * 60,
-        f"Total Tasks: {result.task_count}",
-        "",
-        "Phase Coverage:",
-    ]
-
-    for phase, count in result.phase_coverage.items():
-        report_lines.append(f"  - {phase}: {count} tasks")
-
-    if result.errors:
-        report_lines.append("")
-        report_lines.append("ERRORS (must fix):")
-        for error in result.errors:
-            report_lines.append(f"  ? {error}")
-
-    if result.warnings:
-        report_lines.append("")
-        report_lines.append("WARNINGS:")
-        for warning in result.warnings:
-            report_lines.append(f"  ?? {warning}")
-
-    report_lines.append("")
-    report_lines.append(f"VERDICT: {'APPROVED' if result.is_valid else 'REJECTED'}")
-    report_lines.append("=" * 60)
+    error_lines = (
+        ("", "ERRORS (must fix):", *(f"  ? {error}" for error in result.errors))
+        if result.errors else ()
+    )
+    warning_lines = (
+        ("", "WARNINGS:", *(f"  ?? {warning}" for warning in result.warnings))
+        if result.warnings else ()
+    )
 
-    return "\n".join(report_lines)
+    return "\n".join(chain(
+        (
+            _REPORT_RULE,
+            "PLAN REVIEW GATE",
+            _REPORT_RULE,
+            f"Total Tasks: {result.task_count}",
+            "",
+            "Phase Coverage:",
+        ),
+        (f"  - {phase}: {count} tasks" for phase, count in result.phase_coverage.items()),
+        error_lines,
+        warning_lines,
+        (
+            "",
+            f"VERDICT: {'APPROVED' if result.is_valid else 'REJECTED'}",
+            _REPORT_RULE,
+        ),
+    ))
 
 
 async def plan_review_node(state: SurveyAnalysisState) -> Dict[str, Any]:
@@ -65,10 +103,15 @@ async def plan_review_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     Validates the master plan before execution can proceed.
     """
     columns = state.get("columns", [])
+    plan_json = state.get("plan_json") or {}
+    planned_tasks = plan_json.get("tasks") if plan_json else state.get("tasks")
 
     try:
-        plan = _coerce_plan_from_state(state)
-        validation_result = validate_plan(plan, columns)
+        if not planned_tasks:
+            validation_result = _EMPTY_PLAN_RESULT
+        else:
+            plan = _coerce_plan_from_state(state)
+            validation_result = validate_plan(plan, columns)
     except Exception as exc:
         validation_result = PlanValidationResult(
             is_valid=False,
@@ -79,10 +122,14 @@ async def plan_review_node(state: SurveyAnalysisState) -> Dict[str, Any]:
         )
 
     validation_report = build_validation_report(validation_result)
-    print(validation_report)
+    if logger.isEnabledFor(logging.INFO) and logger.hasHandlers():
+        logger.info("%s", validation_report)
+    else:
+        # Nothing routes workflow logs outside the API; keep the report visible
+        print(validation_report)
 
     log_entry = LogEntry(
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         agent="plan_review",
         action="Plan validation",
         details=f"{'APPROVED' if validation_result.is_valid else 'REJECTED'} - {len(validation_result.errors)} errors, {len(validation_result.warnings)} warnings",
@@ -96,7 +143,7 @@ async def plan_review_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     return {
         "master_plan_approved": validation_result.is_valid,
         "plan_revision_count": new_revision_count,
-        "plan_errors": validation_result.errors,
+        "plan_errors": list(validation_result.errors),
         "execution_log": [log_entry],
         "messages": [
             {
@@ -107,7 +154,7 @@ async def plan_review_node(state: SurveyAnalysisState) -> Dict[str, Any]:
     }
 
 
-def route_after_plan_review(state: SurveyAnalysisState) -> str:
+def route_after_plan_review(state: SurveyAnalysisState) -> Literal["implementer", "strategist", "halt"]:
     """
     Route after plan review.
 
@@ -115,13 +162,7 @@ def route_after_plan_review(state: SurveyAnalysisState) -> str:
         'implementer' if approved, 'strategist' if rejected (for revision),
         'halt' if max revisions reached
     """
-    MAX_PLAN_REVISIONS = 3
-
     if state.get("master_plan_approved", False):
         return "implementer"
-
-    if state.get("plan_revision_count", 0) >= MAX_PLAN_REVISIONS:
-        return "halt"
-
-    return "strategist"
+    return "halt" if state.get("plan_revision_count", 0) >= MAX_PLAN_REVISIONS else "strategist"
 
@@ -4,7 +4,31 @@ Maintains complete state across the multi-agent workflow.
 """
 
 from typing import TypedDict, List, Dict, Any, Optional, Annotated
-from operator import add
+from dataclasses import dataclass
+from datetime import datetime
+
+
+_now = datetime.now
+
+
+def now_iso() -> str:
+    """ISO-8601 timestamp for log entries and QC records."""
+    return _now().isoformat()
+
+
+def append_entries(existing: List[Any], new: List[Any]) -> List[Any]:
+    """
+    Reducer for append-only state lists.
+    Empty updates return the current list untouched. The current list is
+    never extended in place: LangGraph shares channel values with the copies
+    it makes when conditional edges read fresh state, so mutation would
+    apply a node's writes twice.
+    """
+    if not new:
+        return existing
+    if not existing:
+        return list(new)
+    return existing + new
 
 
 class Task(TypedDict):
@@ -21,7 +45,8 @@ class Task(TypedDict):
     status: str  # pending, in_progress, completed, failed
 
 
-class QCDecision(TypedDict):
+@dataclass(slots=True, frozen=True)
+class QCDecision:
     """QC review decision record."""
     task_id: str
     decision: str  # APPROVE, REJECT, CONDITIONAL, HALT
@@ -31,7 +56,8 @@ class QCDecision(TypedDict):
     revision_number: int
 
 
-class LogEntry(TypedDict):
+@dataclass(slots=True, frozen=True)
+class LogEntry:
     """Execution log entry."""
     timestamp: str
     agent: str
@@ -40,6 +66,13 @@ class LogEntry(TypedDict):
     task_id: Optional[str]
 
 
+# Record types stored in checkpoints; registered with the checkpoint serializer
+STATE_RECORD_TYPES = (
+    (__name__, "QCDecision"),
+    (__name__, "LogEntry"),
+)
+
+
 class SurveyAnalysisState(TypedDict):
     """
     Complete state for the survey analysis workflow.
@@ -83,12 +116,12 @@ class SurveyAnalysisState(TypedDict):
     # === WORKBOOK ===
     workbook_path: str
     sheets_created: List[str]
-    formulas_documented: Annotated[List[Dict[str, str]], add]
+    formulas_documented: Annotated[List[Dict[str, str]], append_entries]
     
     # === QC REVIEW ===
     qc_decision: str
     qc_feedback: str
-    qc_history: Annotated[List[QCDecision], add]
+    qc_history: Annotated[List[QCDecision], append_entries]
     
     # === AUDIT ===
     audit_complete: bool
@@ -108,11 +141,11 @@ class SurveyAnalysisState(TypedDict):
     output_excel_path: str
     
     # === LOGGING ===
-    execution_log: Annotated[List[LogEntry], add]
-    errors: Annotated[List[str], add]
+    execution_log: Annotated[List[LogEntry], append_entries]
+    errors: Annotated[List[str], append_entries]
     
     # === MESSAGES (for agent communication) ===
-    messages: Annotated[List[Dict[str, Any]], add]
+    messages: Annotated[List[Dict[str, Any]], append_entries]
 
 
 def create_initial_state(session_id: str, file_path: str) -> SurveyAnalysisState:
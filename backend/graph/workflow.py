@@ -12,10 +12,14 @@ Architecture:
 - deliverables: Generate output files
 """
 
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Set, Tuple, get_args, get_type_hints
+
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 
-from graph.state import SurveyAnalysisState
+from graph.state import SurveyAnalysisState, STATE_RECORD_TYPES
 from graph.nodes import load_data_node, advance_task_node, generate_deliverables_node
 from graph.edges import route_after_qc, route_after_audit, should_continue_tasks
 from graph.plan_review import plan_review_node, route_after_plan_review
@@ -23,6 +27,107 @@ from agents.strategist import strategist_node
 from agents.implementer import implementer_node
 from agents.qc_reviewer import qc_reviewer_node
 from agents.auditor import auditor_node
+from config import MAX_CHECKPOINT_SESSIONS
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer that keeps at most max_threads sessions.
+    When a new checkpoint pushes it over the limit, the thread written
+    least recently is deleted, so a long-lived server does not keep
+    every finished analysis forever.
+    """
+    
+    def __init__(self, max_threads: int = MAX_CHECKPOINT_SESSIONS, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._thread_order: "OrderedDict[str, None]" = OrderedDict()
+    
+    def put(self, config, checkpoint, metadata, new_versions):
+        result = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        self._thread_order[thread_id] = None
+        self._thread_order.move_to_end(thread_id)
+        while len(self._thread_order) > self.max_threads:
+            oldest, _ = self._thread_order.popitem(last=False)
+            self.delete_thread(oldest)
+        return result
+
+
+# Conditional routing: source node -> (router, router outcome -> target node)
+CONDITIONAL_ROUTES: Dict[str, Tuple[Callable, Dict[str, str]]] = {
+    # Plan Review routing: approved -> implementer, rejected -> strategist, halt if max revisions
+    "plan_review": (route_after_plan_review, {
+        "implementer": "implementer",
+        "strategist": "strategist",
+        "halt": "halt"
+    }),
+    "qc_reviewer": (route_after_qc, {
+        "advance_task": "advance_task",
+        "implementer": "implementer",
+        "auditor": "auditor",
+        "error": "error"
+    }),
+    "advance_task": (should_continue_tasks, {
+        "implementer": "implementer",
+        "auditor": "auditor"
+    }),
+    "auditor": (route_after_audit, {
+        "deliverables": "deliverables",
+        "revision_loop": "implementer",  # Trigger revision loop for low quality
+        "halt": "halt"
+    }),
+}
+
+
+def _validate_graph(workflow: StateGraph, entry_point: str) -> None:
+    """
+    Static routing checks, run once when the workflow is built.
+    The graph has deliberate revision loops, so cycles are allowed; instead
+    every router outcome must be mapped, every node must be reachable from
+    the entry point, and every node must have a path to END.
+    
+    Raises:
+        ValueError: If the graph has unmapped outcomes or unreachable/dead-end nodes
+    """
+    successors: Dict[str, Set[str]] = {name: set() for name in workflow.nodes}
+    for start, end in workflow.edges:
+        if start in successors:
+            successors[start].add(end)
+    
+    for source, (router, path_map) in CONDITIONAL_ROUTES.items():
+        outcomes = set(get_args(get_type_hints(router).get("return")))
+        unmapped = outcomes - set(path_map)
+        if unmapped:
+            raise ValueError(f"Router {router.__name__} outcomes not mapped: {sorted(unmapped)}")
+        successors[source].update(path_map.values())
+    
+    reachable = {entry_point}
+    stack = [entry_point]
+    while stack:
+        for nxt in successors.get(stack.pop(), ()):
+            if nxt not in reachable:
+                reachable.add(nxt)
+                stack.append(nxt)
+    unreachable = set(workflow.nodes) - reachable
+    if unreachable:
+        raise ValueError(f"Nodes unreachable from '{entry_point}': {sorted(unreachable)}")
+    
+    predecessors: Dict[str, Set[str]] = {name: set() for name in workflow.nodes}
+    predecessors[END] = set()
+    for source, targets in successors.items():
+        for target in targets:
+            predecessors.setdefault(target, set()).add(source)
+    terminating = {END}
+    stack = [END]
+    while stack:
+        for prev in predecessors.get(stack.pop(), ()):
+            if prev not in terminating:
+                terminating.add(prev)
+                stack.append(prev)
+    dead_ends = set(workflow.nodes) - terminating
+    if dead_ends:
+        raise ValueError(f"Nodes with no path to END: {sorted(dead_ends)}")
 
 
 def create_survey_analysis_workflow():
@@ -71,58 +176,39 @@ def create_survey_analysis_workflow():
     # Strategist -> Plan Review (deterministic validation gate)
     workflow.add_edge("strategist", "plan_review")
     
-    # Plan Review routing: approved -> implementer, rejected -> strategist, halt if max revisions
-    workflow.add_conditional_edges(
-        "plan_review",
-        route_after_plan_review,
-        {
-            "implementer": "implementer",
-            "strategist": "strategist",
-            "halt": "halt"
-        }
-    )
-    
     workflow.add_edge("implementer", "qc_reviewer")
     
-    workflow.add_conditional_edges(
-        "qc_reviewer",
-        route_after_qc,
-        {
-            "advance_task": "advance_task",
-            "implementer": "implementer",
-            "auditor": "auditor",
-            "error": "error"
-        }
-    )
-    
-    workflow.add_conditional_edges(
-        "advance_task",
-        should_continue_tasks,
-        {
-            "implementer": "implementer",
-            "auditor": "auditor"
-        }
-    )
-    
-    workflow.add_conditional_edges(
-        "auditor",
-        route_after_audit,
-        {
-            "deliverables": "deliverables",
-            "revision_loop": "implementer",  # Trigger revision loop for low quality
-            "halt": "halt"
-        }
-    )
+    for source, (router, path_map) in CONDITIONAL_ROUTES.items():
+        workflow.add_conditional_edges(source, router, path_map)
     
     workflow.add_edge("deliverables", END)
     workflow.add_edge("error", END)
     workflow.add_edge("halt", END)
     
-    memory = MemorySaver()
+    _validate_graph(workflow, "load_data")
+    
+    memory = BoundedMemorySaver(
+        serde=JsonPlusSerializer(allowed_msgpack_modules=list(STATE_RECORD_TYPES))
+    )
     
     app = workflow.compile(checkpointer=memory)
     
     return app
 
 
-survey_workflow = create_survey_analysis_workflow()
+_survey_workflow = None
+
+
+def get_survey_workflow():
+    """Return the shared compiled workflow, building it on first use."""
+    global _survey_workflow
+    if _survey_workflow is None:
+        _survey_workflow = create_survey_analysis_workflow()
+    return _survey_workflow
+
+
+def __getattr__(name: str):
+    """Keep `from graph.workflow import survey_workflow` working lazily."""
+    if name == "survey_workflow":
+        return get_survey_workflow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
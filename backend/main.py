@@ -4,20 +4,40 @@ Provides REST API for the LangGraph multi-agent workflow.
 """
 
 import asyncio
+import logging
+import queue
+import shutil
+import sys
 import uuid
+from collections import OrderedDict, deque
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, NamedTuple, Optional
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
-import aiofiles
 
-from config import UPLOAD_DIR, OUTPUT_DIR, ANTHROPIC_API_KEY
-from graph.state import create_initial_state
-from graph.workflow import survey_workflow
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+from config import UPLOAD_DIR, OUTPUT_DIR, ANTHROPIC_API_KEY, MAX_SESSIONS, MAX_CONCURRENT_ANALYSES
+from graph.state import create_initial_state, now_iso
+from graph.workflow import get_survey_workflow
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson when available, for large log payloads."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
 
 
 app = FastAPI(
@@ -34,7 +54,145 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-sessions: Dict[str, Dict[str, Any]] = {}
+sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Uploads are copied to disk in chunks of this size to keep memory flat
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Per-session log retention; /api/status only ever shows the last STATUS_LOG_TAIL
+MAX_SESSION_LOGS = 2000
+MAX_SESSION_ERRORS = 200
+STATUS_LOG_TAIL = 50
+
+
+class SessionLog(NamedTuple):
+    """Compact per-session log record; rendered as a dict by the API."""
+    timestamp: str
+    agent: str
+    message: str
+
+
+def _append_log(session: Dict[str, Any], agent: str, message: str, timestamp: Optional[str] = None) -> None:
+    """Record a log line; agent names are interned so entries share one copy."""
+    session["logs"].append(SessionLog(timestamp or now_iso(), sys.intern(agent), message))
+
+
+# Output files written per session, resolved once and cached in session["output_paths"]
+OUTPUT_PATTERNS = {
+    "xlsm": "PhD_EDA_{session_id}*.xlsm",
+    "xlsx": "PhD_EDA_{session_id}*.xlsx",
+    "md": "AUDIT_CERTIFICATE_{session_id}*",
+}
+
+# Workflow state keys mirrored verbatim into the session on each streamed update
+SESSION_COPY_FIELDS = (
+    "status", "certification", "overall_score", "deliverables",
+    "verification_status", "formula_coverage", "output_type",
+)
+
+# Nodes that report themselves as the current agent
+AGENT_NODES = frozenset({"strategist", "qc_reviewer", "auditor"})
+
+# Caps concurrent workflows; _analysis_tasks keeps launched tasks referenced until done
+_analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+_analysis_tasks: set = set()
+_queued_analyses = 0
+
+# Only sessions with no workflow in flight may be evicted
+EVICTABLE_STATUSES = {"uploaded", "completed", "error", "failed", "halted"}
+
+
+def _register_session(session_id: str, session: Dict[str, Any]) -> None:
+    """
+    Store a new session, evicting the oldest inactive sessions beyond MAX_SESSIONS.
+    Output files stay on disk; only the in-memory logs and state are released.
+    """
+    sessions[session_id] = session
+    sessions.move_to_end(session_id)
+    if len(sessions) <= MAX_SESSIONS:
+        return
+    for old_id in list(sessions):
+        if len(sessions) <= MAX_SESSIONS:
+            break
+        if old_id != session_id and sessions[old_id]["status"] in EVICTABLE_STATUSES:
+            del sessions[old_id]
+
+
+def _glob_output(session_id: str, kind: str) -> Optional[Path]:
+    """Return the first output file of the given kind for a session, if any."""
+    return next(OUTPUT_DIR.glob(OUTPUT_PATTERNS[kind].format(session_id=session_id)), None)
+
+
+def _output_path(session_id: str, session: Dict[str, Any], kind: str) -> Optional[Path]:
+    """
+    Look up a session output file, scanning OUTPUT_DIR only when the
+    cached path is unknown or no longer exists.
+    """
+    cached = session.setdefault("output_paths", {})
+    path = cached.get(kind)
+    if path is None or not path.exists():
+        path = _glob_output(session_id, kind)
+        cached[kind] = path
+    return path
+
+
+def _bump_rev(session: Dict[str, Any]) -> None:
+    """Mark a session as changed so /api/status pollers get a fresh ETag."""
+    session["rev"] = session.get("rev", 0) + 1
+
+
+def _status_etag(session: Dict[str, Any]) -> str:
+    """Weak ETag covering everything /api/status reports for a session."""
+    return f'W/"{session.get("rev", 0)}-{_queued_analyses}"'
+
+
+async def _file_response(path: Path, media_type: str, headers: Optional[Dict[str, str]] = None) -> FileResponse:
+    """
+    Serve an output file, handing Starlette a precomputed stat so it does not
+    stat the file again. Range requests and sendfile are handled by FileResponse.
+    """
+    stat_result = await asyncio.to_thread(path.stat)
+    return FileResponse(
+        str(path),
+        media_type=media_type,
+        filename=path.name,
+        headers=headers,
+        stat_result=stat_result
+    )
+
+
+def _save_upload(src, dst_path: Path) -> None:
+    """Copy an uploaded file object to disk; runs on a worker thread."""
+    src.seek(0)
+    with open(dst_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+
+
+# One queue and handler shared by every workflow logger; Logger.addHandler
+# ignores a handler it already holds, so repeated setup cannot duplicate records
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_queue_handler = QueueHandler(_log_queue)
+_log_listener: Optional[QueueListener] = None
+
+
+def _configure_workflow_logging() -> QueueListener:
+    """
+    Route workflow logs through a queue so nodes never block on stream I/O.
+    A background listener thread drains the queue to stderr. Safe to call
+    more than once; the running listener is reused.
+    """
+    global _log_listener
+    for name in ("graph", "agents", "engines"):
+        workflow_logger = logging.getLogger(name)
+        workflow_logger.setLevel(logging.INFO)
+        workflow_logger.addHandler(_log_queue_handler)
+
+    if _log_listener is None:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s: %(message)s"))
+        _log_listener = QueueListener(_log_queue, stream_handler)
+        _log_listener.start()
+    return _log_listener
 
 
 class AnalysisRequest(BaseModel):
@@ -59,11 +217,14 @@ class StatusResponse(BaseModel):
     verification_status: Optional[str] = None
     formula_coverage: Optional[float] = None
     output_type: Optional[str] = None
+    queued_analyses: int = 0
 
 
 @app.on_event("startup")
 async def startup():
     """Startup event."""
+    _configure_workflow_logging()
+    
     print("🎓 PhD Survey Analyzer - LangGraph Multi-Agent System")
     print(f"📁 Upload dir: {UPLOAD_DIR}")
     print(f"📁 Output dir: {OUTPUT_DIR}")
@@ -74,6 +235,15 @@ async def startup():
         print("✅ Anthropic API key configured")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Flush queued workflow logs."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -110,11 +280,9 @@ async def upload_file(file: UploadFile = File(...)):
     safe_filename = f"{timestamp}_{file.filename}"
     file_path = UPLOAD_DIR / safe_filename
     
-    async with aiofiles.open(file_path, 'wb') as f:
-        content = await file.read()
-        await f.write(content)
+    await asyncio.to_thread(_save_upload, file.file, file_path)
     
-    sessions[session_id] = {
+    _register_session(session_id, {
         "file_path": str(file_path),
         "file_name": file.filename,
         "status": "uploaded",
@@ -123,17 +291,21 @@ async def upload_file(file: UploadFile = File(...)):
         "current_task": None,
         "tasks_completed": 0,
         "total_tasks": 0,
-        "logs": [],
-        "errors": [],
+        "logs": deque(maxlen=MAX_SESSION_LOGS),
+        "errors": deque(maxlen=MAX_SESSION_ERRORS),
         "state": None,
         "certification": None,
         "overall_score": None,
         "output_path": None,
+        "output_paths": {},
         "research_questions": [],  # Will be populated by analyze endpoint
         "verification_status": "pending",
         "formula_coverage": None,
-        "output_type": None
-    }
+        "output_type": None,
+        "qc_approvals": 0,
+        "qc_rejections": 0,
+        "rev": 0
+    })
     
     return {
         "session_id": session_id,
@@ -145,22 +317,33 @@ async def upload_file(file: UploadFile = File(...)):
 
 async def run_analysis(session_id: str):
     """
-    Run the full LangGraph analysis workflow.
+    Run the full LangGraph analysis workflow once a concurrency slot is free.
     
     Args:
         session_id: Session identifier
     """
+    global _queued_analyses
     session = sessions.get(session_id)
     if not session:
         return
     
+    _queued_analyses += 1
+    try:
+        await _analysis_slots.acquire()
+    finally:
+        _queued_analyses -= 1
+    try:
+        await _run_workflow(session_id, session)
+    finally:
+        _analysis_slots.release()
+
+
+async def _run_workflow(session_id: str, session: Dict[str, Any]):
+    """Stream the workflow for a session and mirror its progress into the session."""
     try:
         session["status"] = "running"
-        session["logs"].append({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "system",
-            "message": "Starting LangGraph multi-agent workflow..."
-        })
+        _append_log(session, "system", "Starting LangGraph multi-agent workflow...")
+        _bump_rev(session)
         
         initial_state = create_initial_state(
             session_id=session_id,
@@ -173,21 +356,23 @@ async def run_analysis(session_id: str):
         
         config = {"configurable": {"thread_id": session_id}}
         
-        async for event in survey_workflow.astream(initial_state, config):
+        async for event in get_survey_workflow().astream(initial_state, config):
             for node_name, state_update in event.items():
                 if node_name == "__end__":
                     continue
                 
-                messages = state_update.get("messages", [])
-                for msg in messages:
-                    session["logs"].append({
-                        "timestamp": datetime.now().isoformat(),
-                        "agent": msg.get("role", "system"),
-                        "message": msg.get("content", "")
-                    })
+                ts = now_iso()
+                for msg in state_update.get("messages", []):
+                    content = msg.get("content", "")
+                    _append_log(session, msg.get("role", "system"), content, ts)
+                    if "APPROVE" in content:
+                        session["qc_approvals"] += 1
+                    if "REJECT" in content:
+                        session["qc_rejections"] += 1
                 
-                status = state_update.get("status", session["status"])
-                session["status"] = status
+                for key in SESSION_COPY_FIELDS:
+                    if key in state_update:
+                        session[key] = state_update[key]
                 
                 if "current_task_idx" in state_update:
                     session["tasks_completed"] = state_update["current_task_idx"]
@@ -198,58 +383,36 @@ async def run_analysis(session_id: str):
                 if session["total_tasks"] > 0:
                     session["progress"] = (session["tasks_completed"] / session["total_tasks"]) * 100
                 
-                if "current_task" in state_update and state_update["current_task"]:
+                if state_update.get("current_task"):
                     session["current_task"] = state_update["current_task"].get("name", "")
                     session["current_agent"] = "implementer"
                 
-                if node_name == "strategist":
-                    session["current_agent"] = "strategist"
-                elif node_name == "qc_reviewer":
-                    session["current_agent"] = "qc_reviewer"
-                elif node_name == "auditor":
-                    session["current_agent"] = "auditor"
-                
-                if "certification" in state_update:
-                    session["certification"] = state_update["certification"]
-                
-                if "overall_score" in state_update:
-                    session["overall_score"] = state_update["overall_score"]
-                
-                if "deliverables" in state_update:
-                    session["deliverables"] = state_update["deliverables"]
+                if node_name in AGENT_NODES:
+                    session["current_agent"] = node_name
                 
                 if "errors" in state_update:
                     session["errors"].extend(state_update["errors"])
-
-                if "verification_status" in state_update:
-                    session["verification_status"] = state_update["verification_status"]
-
-                if "formula_coverage" in state_update:
-                    session["formula_coverage"] = state_update["formula_coverage"]
-
-                if "output_type" in state_update:
-                    session["output_type"] = state_update["output_type"]
+            
+            _bump_rev(session)
         
+        session["output_paths"] = {kind: _glob_output(session_id, kind) for kind in OUTPUT_PATTERNS}
         session["status"] = "completed"
         session["progress"] = 100
-        session["logs"].append({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "system",
-            "message": f"✅ Analysis complete! Score: {session.get('overall_score', 0):.1f}% - {session.get('certification', 'N/A')}"
-        })
+        _append_log(
+            session, "system",
+            f"✅ Analysis complete! Score: {session.get('overall_score', 0):.1f}% - {session.get('certification', 'N/A')}"
+        )
+        _bump_rev(session)
         
     except Exception as e:
         session["status"] = "error"
         session["errors"].append(str(e))
-        session["logs"].append({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "system",
-            "message": f"❌ Error: {str(e)}"
-        })
+        _append_log(session, "system", f"❌ Error: {str(e)}")
+        _bump_rev(session)
 
 
 @app.post("/api/analyze")
-async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundTasks):
+async def start_analysis(request: AnalysisRequest):
     """
     Start the analysis workflow.
     
@@ -270,7 +433,11 @@ async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundT
     if request.research_questions:
         session["research_questions"] = request.research_questions
     
-    background_tasks.add_task(run_analysis, request.session_id)
+    session["status"] = "queued"
+    _bump_rev(session)
+    task = asyncio.create_task(run_analysis(request.session_id))
+    _analysis_tasks.add(task)
+    task.add_done_callback(_analysis_tasks.discard)
     
     return {
         "session_id": request.session_id,
@@ -280,7 +447,7 @@ async def start_analysis(request: AnalysisRequest, background_tasks: BackgroundT
 
 
 @app.get("/api/status/{session_id}")
-async def get_status(session_id: str) -> StatusResponse:
+async def get_status(session_id: str, request: Request, response: Response) -> StatusResponse:
     """
     Get analysis status.
     
@@ -288,12 +455,18 @@ async def get_status(session_id: str) -> StatusResponse:
         session_id: Session identifier
     
     Returns:
-        Current status of the analysis
+        Current status of the analysis, or 304 if unchanged since the client's ETag
     """
     session = sessions.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
+    etag = _status_etag(session)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
+    log_tail = list(islice(reversed(session["logs"]), STATUS_LOG_TAIL))
     return StatusResponse(
         session_id=session_id,
         status=session["status"],
@@ -304,22 +477,24 @@ async def get_status(session_id: str) -> StatusResponse:
         total_tasks=session["total_tasks"],
         certification=session.get("certification"),
         overall_score=session.get("overall_score"),
-        logs=session["logs"][-50:],
-        errors=session["errors"],
+        logs=[entry._asdict() for entry in reversed(log_tail)],
+        errors=list(session["errors"]),
         verification_status=session.get("verification_status"),
         formula_coverage=session.get("formula_coverage"),
-        output_type=session.get("output_type")
+        output_type=session.get("output_type"),
+        queued_analyses=_queued_analyses
     )
 
 
-@app.get("/api/logs/{session_id}")
+@app.get("/api/logs/{session_id}", response_class=FastJSONResponse)
 async def get_logs(session_id: str):
     """Get all logs for a session."""
     session = sessions.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return {"logs": session["logs"]}
+    # Log entries hold only strings, so skip jsonable_encoder and render directly
+    return FastJSONResponse({"logs": [entry._asdict() for entry in session["logs"]]})
 
 
 @app.get("/api/download/{session_id}")
@@ -344,19 +519,11 @@ async def download_results(session_id: str):
     if deliverables:
         for path in deliverables:
             if Path(path).exists() and path.endswith(".md"):
-                return FileResponse(
-                    path,
-                    media_type="text/markdown",
-                    filename=Path(path).name
-                )
-    
-    audit_files = list(OUTPUT_DIR.glob(f"AUDIT_CERTIFICATE_{session_id}*"))
-    if audit_files:
-        return FileResponse(
-            str(audit_files[0]),
-            media_type="text/markdown",
-            filename=audit_files[0].name
-        )
+                return await _file_response(Path(path), "text/markdown")
+    
+    audit_file = _output_path(session_id, session, "md")
+    if audit_file:
+        return await _file_response(audit_file, "text/markdown")
     
     raise HTTPException(status_code=404, detail="No output files found")
 
@@ -380,21 +547,19 @@ async def download_excel(session_id: str):
     if session["status"] not in ["completed", "running"]:
         raise HTTPException(status_code=400, detail="Analysis not started or failed")
     
-    xlsm_files = list(OUTPUT_DIR.glob(f"PhD_EDA_{session_id}*.xlsm"))
-    if xlsm_files:
-        return FileResponse(
-            str(xlsm_files[0]),
-            media_type="application/vnd.ms-excel.sheet.macroEnabled.12",
-            filename=xlsm_files[0].name,
+    xlsm_file = _output_path(session_id, session, "xlsm")
+    if xlsm_file:
+        return await _file_response(
+            xlsm_file,
+            "application/vnd.ms-excel.sheet.macroEnabled.12",
             headers={"X-Output-Type": "macro-enabled"}
         )
     
-    xlsx_files = list(OUTPUT_DIR.glob(f"PhD_EDA_{session_id}*.xlsx"))
-    if xlsx_files:
-        return FileResponse(
-            str(xlsx_files[0]),
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            filename=xlsx_files[0].name,
+    xlsx_file = _output_path(session_id, session, "xlsx")
+    if xlsx_file:
+        return await _file_response(
+            xlsx_file,
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"X-Output-Type": "standard"}
         )
     
@@ -416,11 +581,11 @@ async def get_verification_status(session_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    xlsx_files = list(OUTPUT_DIR.glob(f"PhD_EDA_{session_id}*.xlsx"))
-    xlsm_files = list(OUTPUT_DIR.glob(f"PhD_EDA_{session_id}*.xlsm"))
+    xlsx_file = _output_path(session_id, session, "xlsx")
+    xlsm_file = _output_path(session_id, session, "xlsm")
     
-    workbook_exists = bool(xlsx_files or xlsm_files)
-    output_type = "macro-enabled" if xlsm_files else ("standard" if xlsx_files else "none")
+    workbook_exists = bool(xlsx_file or xlsm_file)
+    output_type = "macro-enabled" if xlsm_file else ("standard" if xlsx_file else "none")
     
     return {
         "session_id": session_id,
@@ -428,10 +593,8 @@ async def get_verification_status(session_id: str):
         "output_type": output_type,
         "verification_status": session.get("verification_status", "pending"),
         "formula_coverage": session.get("formula_coverage"),
-        "qc_approvals": sum(1 for log in session.get("logs", []) 
-                          if "APPROVE" in log.get("message", "")),
-        "qc_rejections": sum(1 for log in session.get("logs", []) 
-                           if "REJECT" in log.get("message", ""))
+        "qc_approvals": session.get("qc_approvals", 0),
+        "qc_rejections": session.get("qc_rejections", 0)
     }
 
 
@@ -4,7 +4,7 @@ Ensures type-safe, validated task specifications from the strategist.
 """
 
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
 
@@ -45,8 +45,15 @@ class TaskPhase(str, Enum):
     DELIVERABLES = "8_Deliverables"
 
 
+# Characters Excel forbids in sheet names; translate() with this table strips them
+INVALID_SHEET_CHARS = '\\/*?:[]'
+_STRIP_INVALID_SHEET_CHARS = str.maketrans('', '', INVALID_SHEET_CHARS)
+
+
 class ColumnSpec(BaseModel):
     """Specification for columns to analyze."""
+    model_config = ConfigDict(frozen=True)
+    
     column_names: List[str] = Field(default_factory=list)
     column_type: Literal["numeric", "categorical", "all"] = "all"
     max_columns: Optional[int] = None
@@ -57,6 +64,8 @@ class TaskSpec(BaseModel):
     Structured task specification.
     Validated by Pydantic - no regex parsing needed.
     """
+    model_config = ConfigDict(frozen=True)
+    
     id: str = Field(..., pattern=r"^\d+\.\d+$", description="Task ID like '1.1'")
     phase: TaskPhase
     task_type: TaskType
@@ -71,10 +80,9 @@ class TaskSpec(BaseModel):
     @classmethod
     def validate_sheet_name(cls, v: str) -> str:
         """Ensure Excel-compatible sheet name."""
-        invalid_chars = ['\\', '/', '*', '?', ':', '[', ']']
-        for char in invalid_chars:
-            if char in v:
-                raise ValueError(f"Sheet name cannot contain '{char}'")
+        if len(v.translate(_STRIP_INVALID_SHEET_CHARS)) != len(v):
+            char = next(c for c in INVALID_SHEET_CHARS if c in v)
+            raise ValueError(f"Sheet name cannot contain '{char}'")
         return v[:31]
 
 
@@ -88,20 +96,9 @@ class MasterPlan(BaseModel):
     total_observations: int
     detected_scales: List[str] = Field(default_factory=list)
     research_questions: List[str] = Field(default_factory=list)
+    # Phase order is not enforced; tasks execute in list order
     tasks: List[TaskSpec] = Field(..., min_length=40, max_length=60)
     
-    @field_validator('tasks')
-    @classmethod
-    def validate_task_order(cls, tasks: List[TaskSpec]) -> List[TaskSpec]:
-        """Ensure tasks are properly ordered by phase."""
-        phase_order = {p: i for i, p in enumerate(TaskPhase)}
-        for i in range(1, len(tasks)):
-            curr_phase = phase_order.get(tasks[i].phase, 99)
-            prev_phase = phase_order.get(tasks[i-1].phase, 99)
-            if curr_phase < prev_phase:
-                pass  # Allow flexibility but could enforce strict ordering
-        return tasks
-    
     def get_tasks_by_phase(self, phase: TaskPhase) -> List[TaskSpec]:
         """Get all tasks in a specific phase."""
         return [t for t in self.tasks if t.phase == phase]
@@ -113,6 +110,8 @@ class MasterPlan(BaseModel):
 
 class PlanValidationResult(BaseModel):
     """Result of plan validation checks."""
+    model_config = ConfigDict(frozen=True)
+    
     is_valid: bool
     errors: List[str] = Field(default_factory=list)
     warnings: List[str] = Field(default_factory=list)
@@ -120,6 +119,22 @@ class PlanValidationResult(BaseModel):
     phase_coverage: dict = Field(default_factory=dict)
 
 
+# Phases and task types every master plan must cover
+REQUIRED_PHASES = frozenset({TaskPhase.DATA_VALIDATION, TaskPhase.DESCRIPTIVE, TaskPhase.SYNTHESIS})
+REQUIRED_TASK_TYPES = frozenset({
+    TaskType.DATA_AUDIT,
+    TaskType.DATA_DICTIONARY,
+    TaskType.MISSING_DATA,
+    TaskType.DESCRIPTIVE_STATS,
+    TaskType.NORMALITY_CHECK,
+    TaskType.RELIABILITY_ALPHA,
+    TaskType.CORRELATION_MATRIX,
+    TaskType.GROUP_COMPARISON,
+    TaskType.EFFECT_SIZES
+})
+_PHASE_KEYS = tuple(phase.value for phase in TaskPhase)
+
+
 def validate_plan(plan: MasterPlan, available_columns: List[str]) -> PlanValidationResult:
     """
     Deterministic validation of master plan.
@@ -133,57 +148,64 @@ def validate_plan(plan: MasterPlan, available_columns: List[str]) -> PlanValidat
     """
     errors = []
     warnings = []
+    reliability_errors = []
+    known_columns = frozenset(available_columns)
+    
+    # Single pass over tasks: collect phases, types, ids, sheets and per-task issues
+    present_phases = set()
+    present_types = set()
+    seen_ids = set()
+    seen_sheets = set()
+    duplicate_ids = False
+    duplicate_sheets = False
+    phase_coverage = dict.fromkeys(_PHASE_KEYS, 0)
+    
+    for task in plan.tasks:
+        phase = task.phase
+        task_type = task.task_type
+        present_phases.add(phase)
+        present_types.add(task_type)
+        phase_coverage[phase.value] += 1
+        
+        if task.id in seen_ids:
+            duplicate_ids = True
+        else:
+            seen_ids.add(task.id)
+        
+        if task.output_sheet in seen_sheets:
+            duplicate_sheets = True
+        else:
+            seen_sheets.add(task.output_sheet)
+        
+        # Validate column references
+        for col in task.columns.column_names:
+            if col not in known_columns:
+                warnings.append(f"Task {task.id}: Column '{col}' not found in dataset")
+        
+        # Check scale items for reliability tasks
+        if task_type == TaskType.RELIABILITY_ALPHA:
+            if not task.scale_items or len(task.scale_items) < 2:
+                reliability_errors.append(
+                    f"Task {task.id}: Reliability analysis requires at least 2 scale items"
+                )
     
     # Check required phases are present
-    required_phases = {TaskPhase.DATA_VALIDATION, TaskPhase.DESCRIPTIVE, TaskPhase.SYNTHESIS}
-    present_phases = {t.phase for t in plan.tasks}
-    missing_phases = required_phases - present_phases
+    missing_phases = REQUIRED_PHASES - present_phases
     if missing_phases:
         errors.append(f"Missing required phases: {[p.value for p in missing_phases]}")
 
     # Check required task types are present
-    required_types = {
-        TaskType.DATA_AUDIT,
-        TaskType.DATA_DICTIONARY,
-        TaskType.MISSING_DATA,
-        TaskType.DESCRIPTIVE_STATS,
-        TaskType.NORMALITY_CHECK,
-        TaskType.RELIABILITY_ALPHA,
-        TaskType.CORRELATION_MATRIX,
-        TaskType.GROUP_COMPARISON,
-        TaskType.EFFECT_SIZES
-    }
-    present_types = {t.task_type for t in plan.tasks}
-    missing_types = required_types - present_types
+    missing_types = REQUIRED_TASK_TYPES - present_types
     if missing_types:
         errors.append(f"Missing required task types: {[t.value for t in missing_types]}")
     
-    # Check for duplicate task IDs
-    task_ids = [t.id for t in plan.tasks]
-    if len(task_ids) != len(set(task_ids)):
+    if duplicate_ids:
         errors.append("Duplicate task IDs found")
     
-    # Check for duplicate sheet names
-    sheet_names = [t.output_sheet for t in plan.tasks]
-    if len(sheet_names) != len(set(sheet_names)):
+    if duplicate_sheets:
         errors.append("Duplicate output sheet names found")
     
-    # Validate column references
-    for task in plan.tasks:
-        for col in task.columns.column_names:
-            if col not in available_columns:
-                warnings.append(f"Task {task.id}: Column '{col}' not found in dataset")
-    
-    # Check scale items for reliability tasks
-    reliability_tasks = [t for t in plan.tasks if t.task_type == TaskType.RELIABILITY_ALPHA]
-    for task in reliability_tasks:
-        if not task.scale_items or len(task.scale_items) < 2:
-            errors.append(f"Task {task.id}: Reliability analysis requires at least 2 scale items")
-    
-    # Phase coverage
-    phase_coverage = {phase.value: 0 for phase in TaskPhase}
-    for task in plan.tasks:
-        phase_coverage[task.phase.value] += 1
+    errors.extend(reliability_errors)
     
     return PlanValidationResult(
         is_valid=len(errors) == 0,
@@ -0,0 +1,165 @@
+"""
+Unit tests for the formula-only Excel workbook writer.
+Tests tools/excel_tools.py round trips through openpyxl (and xlsxwriter
+when installed).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from tools.excel_tools import BufferedSheet, ExcelFormulaWorkbook, HEADER_FILL, xlsxwriter
+
+
+WRITER_MODES = [
+    pytest.param({"write_only": True, "engine": "openpyxl"}, id="write_only"),
+    pytest.param({"write_only": False, "engine": "openpyxl"}, id="regular"),
+    pytest.param(
+        {"write_only": True, "engine": "xlsxwriter"}, id="xlsxwriter",
+        marks=pytest.mark.skipif(xlsxwriter is None, reason="xlsxwriter not installed")
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def raw_df():
+    """Small survey frame with a missing value and a constant column."""
+    return pd.DataFrame({
+        "age": np.array([21, 34, 45, 29, 38], dtype=np.int64),
+        "score": [3.5, np.nan, 4.0, 2.5, 5.0],
+        "const": [1.0, 1.0, 1.0, 1.0, 1.0],
+        "group": ["A", "B", "A", "B", "A"]
+    })
+
+
+def _build_workbook(path, raw_df, **kwargs):
+    """Write one sheet of every kind and return the reloaded workbook."""
+    wb = ExcelFormulaWorkbook(path, **kwargs)
+    mapping = {"age": "A", "score": "B", "const": "C"}
+    variables = ["age", "score", "const"]
+    n = len(raw_df)
+
+    wb.write_raw_data(wb.create_sheet("RAW"), raw_df)
+    wb.write_descriptives_formulas(wb.create_sheet("DESC"), variables, "RAW", mapping, n)
+    wb.write_codebook_formulas(wb.create_sheet("CODEBOOK"), list(raw_df.columns), "RAW", n)
+    wb.write_correlation_matrix_formulas(wb.create_sheet("CORR"), variables, "RAW", mapping, n, df=raw_df)
+    wb.write_text_content(wb.create_sheet("NOTES"), "NOTES", "line one\nline two")
+    wb.save()
+    return load_workbook(path)
+
+
+@pytest.mark.parametrize("options", WRITER_MODES)
+class TestWorkbookRoundTrip:
+    """Round-trip every sheet writer through save() and load_workbook()."""
+
+    def test_raw_sheet(self, tmp_path, raw_df, options):
+        """Test raw values, blanks, header style, frozen panes and protection."""
+        ws = _build_workbook(tmp_path / "out.xlsx", raw_df, **options)["RAW"]
+
+        assert [c.value for c in ws[1]] == ["age", "score", "const", "group"]
+        assert [c.value for c in ws[2]] == [21, 3.5, 1, "A"]
+        assert ws["B3"].value is None
+        assert ws["A1"].font.b
+        assert ws["A1"].fill.fgColor.rgb == HEADER_FILL.fgColor.rgb
+        assert ws.freeze_panes == "A2"
+        assert ws.protection.sheet
+        assert ws.protection.password
+        assert ws.max_row == len(raw_df) + 1
+
+    def test_formula_sheets(self, tmp_path, raw_df, options):
+        """Test descriptives, codebook, correlation and text sheets hold the expected cells."""
+        wb = _build_workbook(tmp_path / "out.xlsx", raw_df, **options)
+
+        desc = wb["DESC"]
+        assert desc["A5"].value == "Variable"
+        assert desc["A5"].font.b
+        assert desc["A6"].value == "age"
+        assert desc["B6"].value == "=COUNT('RAW'!A2:A6)"
+        assert desc["E6"].value == "=ROUND(N6,3)"
+        assert desc.column_dimensions["N"].hidden
+        assert not desc.column_dimensions["M"].hidden
+
+        codebook = wb["CODEBOOK"]
+        assert codebook["A1"].value == "VARIABLE CODEBOOK"
+        assert codebook["A1"].font.sz == 14
+        assert codebook["A9"].value == "group"
+        assert codebook["C6"].value == "=COUNT('RAW'!A2:A6)"
+
+        corr = wb["CORR"]
+        assert corr["B6"].value == "=1"
+        assert corr["C6"].value == "=ROUND(CORREL('RAW'!A2:A6,'RAW'!B2:B6),2)"
+        assert corr["B7"].value == "=C6"
+        assert corr["D6"].value == '="N/A"'
+
+        notes = wb["NOTES"]
+        assert notes["A1"].value == "NOTES"
+        assert [notes["A4"].value, notes["A5"].value] == ["line one", "line two"]
+
+
+class TestBufferedSheet:
+    """Tests for the write-only BufferedSheet ordering rules."""
+
+    @pytest.fixture
+    def sheet(self, tmp_path):
+        wb = Workbook(write_only=True)
+        sheet = BufferedSheet(wb.create_sheet("S"))
+        yield sheet
+        sheet.flush()
+        wb.save(tmp_path / "buffered.xlsx")
+
+    def test_cell_in_written_row_rejected(self, sheet):
+        """Test cells cannot be buffered into rows already streamed."""
+        sheet.append(["header"])
+        with pytest.raises(ValueError, match="Row 1 of 'S' has already been written"):
+            sheet.cell(row=1, column=2, value="late")
+
+    def test_append_after_buffered_cells_rejected(self, sheet):
+        """Test rows cannot be appended once cells are buffered."""
+        sheet["B3"] = "=1"
+        with pytest.raises(RuntimeError, match="appended before cells are buffered"):
+            sheet.append(["row"])
+
+
+class TestFormulaLog:
+    """Tests for the streamed formula audit log."""
+
+    def test_log_round_trip(self, tmp_path):
+        """Test entries are logged to the sidecar and read back as a list."""
+        wb = ExcelFormulaWorkbook(tmp_path / "log.xlsx", engine="openpyxl")
+        ws = wb.create_sheet("CALC")
+        wb.write_formula(ws, "A1", "=1+1")
+        wb.write_formulas_bulk(ws, [((2, 1), "=2"), ("B2", "=A2*2")])
+
+        log = wb.get_formula_log()
+        assert isinstance(log, list)
+        assert [entry["cell"] for entry in log] == ["A1", "A2", "B2"]
+        assert wb.formula_log == log
+        assert wb.formula_count == 3
+
+        wb.save()
+        assert wb.formula_log_path == tmp_path / "log.formulas.jsonl"
+        assert wb.formula_log_path.exists()
+
+    def test_write_after_save_appends(self, tmp_path):
+        """Test formulas written after save() are still logged."""
+        with ExcelFormulaWorkbook(tmp_path / "log.xlsx", engine="openpyxl") as wb:
+            ws = wb.create_sheet("CALC")
+            wb.write_formula(ws, "A1", "=1")
+            wb.save()
+            wb.write_formula(ws, "A2", "=2")
+            assert len(wb.get_formula_log()) == 2
+
+    def test_no_sidecar_without_formulas(self, tmp_path):
+        """Test no log file is created until a formula is written."""
+        (tmp_path / "empty.formulas.jsonl").write_text('{"stale": 1}\n')
+        with ExcelFormulaWorkbook(tmp_path / "empty.xlsx", engine="openpyxl") as wb:
+            assert wb.get_formula_log() == []
+
+    def test_rejects_literal(self, tmp_path):
+        """Test non-formula values are rejected before anything is logged."""
+        with ExcelFormulaWorkbook(tmp_path / "log.xlsx", engine="openpyxl") as wb:
+            ws = wb.create_sheet("CALC")
+            with pytest.raises(ValueError, match="REJECTED"):
+                wb.write_formulas_bulk(ws, [("A1", "=1"), ("A2", "2")])
+            assert wb.get_formula_log() == []
@@ -4,9 +4,8 @@ Tests the production engines/formula_engine.py module.
 """
 
 import pytest
-import tempfile
-from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
 
@@ -14,35 +13,35 @@ from engines.formula_engine import FormulaEngine
 from models.task_schema import TaskType, TaskSpec
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_df():
-    """Create sample DataFrame for testing."""
+    """Create sample DataFrame for testing (shared across the module; not mutated)."""
+    i = np.arange(100, dtype=np.int64)
     return pd.DataFrame({
-        "ID": range(1, 101),
-        "Age": [25 + i % 40 for i in range(100)],
-        "Score": [50 + i % 50 for i in range(100)],
-        "Group": ["A" if i % 2 == 0 else "B" for i in range(100)],
-        "Rating": [3.5 + (i % 5) * 0.5 for i in range(100)]
+        "ID": i + 1,
+        "Age": 25 + i % 40,
+        "Score": 50 + i % 50,
+        "Group": np.where(i % 2 == 0, "A", "B"),
+        "Rating": np.asarray(3.5 + (i % 5) * 0.5, dtype=np.float64)
     })
 
 
-@pytest.fixture
-def temp_workbook(sample_df):
-    """Create a temporary workbook with raw data."""
-    with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as f:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "00_RAW_DATA_LOCKED"
-        
-        for col_idx, col_name in enumerate(sample_df.columns, 1):
-            ws.cell(row=1, column=col_idx, value=col_name)
-        
-        for row_idx, row in enumerate(sample_df.itertuples(index=False), 2):
-            for col_idx, value in enumerate(row, 1):
-                ws.cell(row=row_idx, column=col_idx, value=value)
-        
-        wb.save(f.name)
-        yield Path(f.name)
+@pytest.fixture(scope="module")
+def temp_workbook(sample_df, tmp_path_factory):
+    """
+    Create a temporary workbook with raw data, written once per module.
+    Task tests each add a differently named output sheet, so sharing is safe.
+    """
+    path = tmp_path_factory.mktemp("formula_engine") / "workbook.xlsx"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("00_RAW_DATA_LOCKED")
+    
+    ws.append(list(sample_df.columns))
+    for row in sample_df.itertuples(index=False, name=None):
+        ws.append(row)
+    
+    wb.save(path)
+    return path
 
 
 class TestFormulaEngine:
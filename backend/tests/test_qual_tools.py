@@ -0,0 +1,208 @@
+"""
+Unit tests for the qualitative analysis tools.
+Tests automated coding, reliability and the Excel writers.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from tools import qual_tools
+from tools.qual_tools import (
+    Codebook,
+    Code,
+    Theme,
+    CodingResult,
+    AutomatedCoder,
+    calculate_cohens_kappa,
+    generate_frequency_table,
+    generate_cooccurrence_matrix,
+    write_codebook_to_excel,
+    write_coding_results_to_excel
+)
+
+
+RESPONSES = [
+    "The staff were friendly and polite",
+    "Too EXPENSIVE for what you get",
+    "Staffing levels were low, prices high",
+    "cheap-ish but the staffers were rude",
+    "Friendliness matters; politeness too",
+    "nothing to report",
+    "",
+]
+
+
+def _reference_codes(codebook, text):
+    """Per-keyword regex matching as originally implemented."""
+    assigned = []
+    for code_id, code in codebook.codes.items():
+        patterns = [
+            re.compile(rf'\b{re.escape(word)}\w*\b', re.IGNORECASE)
+            for word in code.name.lower().split() if len(word) > 3
+        ]
+        patterns += [
+            re.compile(rf'\b{re.escape(example.lower())}\b', re.IGNORECASE)
+            for example in code.examples
+        ]
+        if any(pattern.search(text) for pattern in patterns):
+            assigned.append(code_id)
+    return assigned
+
+
+def _results(assignments):
+    return [CodingResult(str(i), "", codes, "coder") for i, codes in enumerate(assignments)]
+
+
+@pytest.fixture
+def codebook():
+    """Create a small codebook with one theme."""
+    cb = Codebook(name="test")
+    cb.add_code(Code(id="C01", name="Friendly staff", definition="Staff attitude", examples=["polite"]))
+    cb.add_code(Code(id="C02", name="Price", definition="Cost", examples=["expensive", "cheap"]))
+    cb.add_theme(Theme(id="T01", name="Service", description="Service themes", codes=["C01"]))
+    return cb
+
+
+@pytest.fixture(params=["regex", "aho_corasick"])
+def coder_factory(request, monkeypatch):
+    """Build AutomatedCoders with and without the Aho-Corasick prefilter."""
+    if request.param == "regex":
+        monkeypatch.setattr(qual_tools, "ahocorasick", None)
+    elif qual_tools.ahocorasick is None:
+        pytest.skip("pyahocorasick not installed")
+    return AutomatedCoder
+
+
+class TestAutomatedCoder:
+    """Tests for keyword coding on both matching paths."""
+
+    def test_matches_per_keyword_reference(self, coder_factory, codebook):
+        """Test the combined alternation assigns the same codes as one regex per keyword."""
+        coder = coder_factory(codebook)
+
+        for text in RESPONSES:
+            assert coder.code_response("r", text).assigned_codes == _reference_codes(codebook, text)
+
+    def test_prefix_and_whole_word_rules(self, coder_factory, codebook):
+        """Test name words match as prefixes and examples only as whole words."""
+        coder = coder_factory(codebook)
+
+        assert coder.code_response("r", "STAFFERS everywhere").assigned_codes == ["C01"]
+        assert coder.code_response("r", "impolitely cheaper").assigned_codes == []
+
+    def test_all_codes_matched(self, coder_factory, codebook):
+        """Test a response hitting every code early still confirms each one."""
+        coder = coder_factory(codebook)
+
+        assert coder.code_response("r", "polite cheap " * 50).assigned_codes == ["C01", "C02"]
+
+    def test_code_dataframe_column_skips_missing(self, coder_factory, codebook):
+        """Test missing and 'nan' responses are skipped and index labels kept."""
+        df = pd.DataFrame({"text": ["polite", None, np.nan, "nan", "cheap"]}, index=list("abcde"))
+
+        results = coder_factory(codebook).code_dataframe_column(df, "text")
+
+        assert [(r.response_id, r.assigned_codes) for r in results] == [("a", ["C01"]), ("e", ["C02"])]
+
+
+class TestReliability:
+    """Tests for Cohen's kappa."""
+
+    def test_kappa_kernels_agree(self):
+        """Test the loop (numba) kernel matches the NumPy kernel."""
+        rng = np.random.default_rng(0)
+        a = rng.random((200, 12)) < 0.3
+        b = rng.random((200, 12)) < 0.4
+
+        expected = qual_tools._kappa_counts_numpy(a, b)
+        assert qual_tools._kappa_counts_loop(a, b) == expected
+        assert tuple(int(v) for v in qual_tools._kappa_counts(a, b)) == expected
+
+    @pytest.mark.parametrize("kernel", ["_kappa_counts_numpy", "_kappa_counts_loop"])
+    def test_kappa_value(self, monkeypatch, kernel):
+        """Test kappa against a hand-computed value on either kernel."""
+        monkeypatch.setattr(qual_tools, "_kappa_counts", getattr(qual_tools, kernel))
+        coder1 = _results([["A"], ["A", "B"], [], ["B"]])
+        coder2 = _results([["A"], ["A"], ["B"], ["B"]])
+
+        # p_o = 6/8, p1 = p2 = 4/8, p_e = 0.5
+        assert calculate_cohens_kappa(coder1, coder2, ["A", "B"]) == pytest.approx(0.5)
+
+    def test_kappa_degenerate(self):
+        """Test no shared responses or no codes give 0 and full agreement gives 1."""
+        assert calculate_cohens_kappa(_results([["A"]]), [], ["A"]) == 0.0
+        assert calculate_cohens_kappa(_results([["A"]]), _results([["A"]]), []) == 0.0
+        assert calculate_cohens_kappa(_results([[]]), _results([[]]), ["A"]) == 1.0
+
+
+class TestSummaries:
+    """Tests for frequency and co-occurrence tables."""
+
+    def test_frequency_table(self, codebook):
+        """Test counts, percentages and ordering."""
+        table = generate_frequency_table(_results([["C02"], ["C01", "C02"], [], ["C02", "X"]]), codebook)
+
+        assert table["Code ID"].tolist() == ["C02", "C01"]
+        assert table["Frequency"].tolist() == [3, 1]
+        assert table["Percentage"].tolist() == [75.0, 25.0]
+
+    def test_frequency_table_no_results(self, codebook):
+        """Test an empty result set gives zero counts."""
+        table = generate_frequency_table([], codebook)
+
+        assert table["Frequency"].tolist() == [0, 0]
+        assert table["Percentage"].tolist() == [0, 0]
+
+    def test_cooccurrence_matrix(self):
+        """Test pair counts, symmetry and per-response diagonal counts."""
+        results = _results([["A", "B"], ["A", "C"], ["A", "A"], ["B", "Z"], []])
+
+        matrix = generate_cooccurrence_matrix(results, ["A", "B", "C"])
+
+        assert list(matrix.index) == list(matrix.columns) == ["A", "B", "C"]
+        assert matrix.to_numpy().tolist() == [[3, 1, 1], [1, 2, 0], [1, 0, 1]]
+        assert matrix.dtypes.eq(np.int64).all()
+
+
+class TestExcelWriters:
+    """Tests for codebook and coding result writers."""
+
+    def test_coding_results_rewrite_in_place(self):
+        """Test re-running the writer on the same sheet overwrites instead of appending."""
+        ws = Workbook().active
+        results = [CodingResult("1", "text", ["C01"], "coder_1")]
+
+        first = write_coding_results_to_excel(results, ws)
+        second = write_coding_results_to_excel(results, ws)
+
+        assert first == second == 4
+        assert [c.value for c in ws["A"]] == ["Response ID", "1"]
+
+    def test_codebook_start_row(self, codebook):
+        """Test the codebook is written at start_row on a sheet with content."""
+        ws = Workbook().active
+        ws["A1"] = "existing"
+
+        next_row = write_codebook_to_excel(codebook, ws, start_row=3)
+
+        assert ws["A1"].value == "existing"
+        assert ws["A3"].value == "CODEBOOK: test"
+        assert ws["A5"].value == "Code ID"
+        assert ws["F6"].value == "Service"
+        assert ws["A10"].value == "THEMES"
+        assert ws["D12"].value == 1
+        assert next_row == 14
+
+    def test_coding_results_write_only(self, tmp_path):
+        """Test write-only sheets are streamed and return None."""
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("R")
+
+        assert write_coding_results_to_excel([CodingResult("1", "t", [], "c")], ws) is None
+
+        wb.save(tmp_path / "coding.xlsx")
+        assert load_workbook(tmp_path / "coding.xlsx")["R"]["A2"].value == "1"
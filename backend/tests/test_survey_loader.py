@@ -0,0 +1,54 @@
+"""
+Unit tests for survey file loading.
+Tests the parquet sidecar cache in tools/survey_loader.py.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from tools import survey_loader
+from tools.survey_loader import load_survey_dataframe
+
+
+pytestmark = pytest.mark.skipif(survey_loader.pyarrow is None, reason="pyarrow not installed")
+
+
+def _write_survey(path, scores, mtime_ns):
+    pd.DataFrame({"id": range(len(scores)), "score": scores}).to_excel(path, index=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestSurveyCache:
+    """Tests for the parquet sidecar cache."""
+
+    def test_cache_reused(self, tmp_path, monkeypatch):
+        """Test an unchanged source is read back from its sidecar."""
+        source = tmp_path / "survey.xlsx"
+        _write_survey(source, [1, 2, 3], 1_000_000_000)
+        first = load_survey_dataframe(source)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("source re-parsed")
+
+        monkeypatch.setattr(survey_loader.pd, "read_excel", fail)
+        pd.testing.assert_frame_equal(load_survey_dataframe(source), first)
+
+    def test_stale_sidecars_removed(self, tmp_path):
+        """Test a changed source replaces its old sidecar and leaves no temp files."""
+        source = tmp_path / "survey.xlsx"
+        other = tmp_path / "survey.v2.0_0.parquet"
+        other.write_bytes(b"")
+        _write_survey(source, [1, 2, 3], 1_000_000_000)
+        load_survey_dataframe(source)
+
+        _write_survey(source, [4, 5], 2_000_000_000)
+        df = load_survey_dataframe(source)
+
+        assert df["score"].tolist() == [4, 5]
+        assert sorted(p.name for p in tmp_path.iterdir()) == sorted([
+            "survey.xlsx",
+            other.name,
+            f"survey.2000000000_{source.stat().st_size}.parquet",
+        ])
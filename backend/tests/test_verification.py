@@ -6,8 +6,6 @@ Tests statistical verification against Python ground truth.
 import pytest
 import numpy as np
 import pandas as pd
-from pathlib import Path
-import tempfile
 
 from tools.verification import (
     StatisticalVerifier,
@@ -18,14 +16,15 @@ from tools.verification import (
     STATISTICAL_TOLERANCE,
     generate_verification_report
 )
+from tools import formula_eval, verification
 
 
 class TestStatisticalVerifier:
     """Tests for StatisticalVerifier class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_data(self):
-        """Create sample DataFrame for testing."""
+        """Create sample DataFrame for testing (shared; copy before modifying)."""
         np.random.seed(42)
         return pd.DataFrame({
             'age': np.random.normal(35, 10, 100),
@@ -34,7 +33,7 @@ class TestStatisticalVerifier:
             'group': np.random.choice(['A', 'B'], 100)
         })
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def verifier(self, sample_data):
         """Create StatisticalVerifier instance."""
         return StatisticalVerifier(sample_data)
@@ -57,6 +56,7 @@ class TestStatisticalVerifier:
     
     def test_compute_descriptives_with_missing(self, sample_data):
         """Test descriptives with missing values."""
+        sample_data = sample_data.copy()
         sample_data.loc[0:9, 'age'] = np.nan
         verifier = StatisticalVerifier(sample_data)
         
@@ -113,6 +113,14 @@ class TestStatisticalVerifier:
         assert isinstance(alpha, float)
         assert 0 <= alpha <= 1
     
+    def test_scale_variance_kernels_agree(self):
+        """Test the loop (numba) kernel matches the NumPy kernel."""
+        items = np.random.default_rng(0).integers(1, 6, (200, 6)).astype(float)
+        
+        expected = verification._scale_variances_numpy(items)
+        assert verification._scale_variances_loop(items) == pytest.approx(expected)
+        assert verification._scale_variances(items) == pytest.approx(expected)
+    
     def test_compute_shapiro_wilk(self, verifier):
         """Test Shapiro-Wilk test computation."""
         w, p = verifier.compute_shapiro_wilk('age')
@@ -256,6 +264,30 @@ class TestGenerateVerificationReport:
         assert "PASS" in report or "✓" in report
 
 
+class TestFormulaEvalFunctions:
+    """Tests for the Python implementations of Excel functions pycel lacks."""
+    
+    def test_moments_match_descriptives(self):
+        """Test STDEV.S/SKEW/KURT agree with StatisticalVerifier on a range with blanks."""
+        values = [1.0, 4.0, None, 2.5, 9.0, 3.0, 'n/a', 7.5]
+        rng = tuple((v,) for v in values)
+        expected = StatisticalVerifier(
+            pd.DataFrame({'x': pd.to_numeric(pd.Series(values), errors='coerce')})
+        ).compute_descriptives('x')
+        
+        assert formula_eval.stdev_s(rng) == pytest.approx(expected['std'])
+        assert formula_eval.skew(rng) == pytest.approx(expected['skewness'])
+        assert formula_eval.kurt(rng) == pytest.approx(expected['kurtosis'])
+        assert formula_eval.countblank(rng) == 1
+    
+    def test_excel_errors(self):
+        """Test degenerate inputs return Excel error codes."""
+        assert formula_eval.stdev_s(((1.0,),)) == '#DIV/0!'
+        assert formula_eval.kurt(((1.0,), (2.0,), (3.0,))) == '#DIV/0!'
+        assert formula_eval.correl(((1.0,), (2.0,)), ((1.0,),)) == '#N/A'
+        assert formula_eval.skew(((1.0,), ('#VALUE!',))) == '#VALUE!'
+
+
 class TestTolerances:
     """Tests for tolerance constants."""
     
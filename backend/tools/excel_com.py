@@ -5,32 +5,112 @@ Requires Excel + pywin32.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Iterable
 
 try:
     import win32com.client as win32  # type: ignore
 except Exception:
     win32 = None
 
+XL_CALCULATION_AUTOMATIC = -4105
+XL_CALCULATION_MANUAL = -4135
 
-def recalculate_workbook(workbook_path: Path) -> None:
+
+class ExcelSession:
     """
-    Force Excel to recalculate all formulas (including UDFs) and save.
+    One hidden Excel instance reused for several recalculations.
+
+    Launching Excel takes seconds, so callers recalculating more than one
+    workbook should do it inside a single session:
+
+        with ExcelSession() as session:
+            for path in paths:
+                session.recalc(path)
     """
-    if win32 is None:
-        raise RuntimeError("pywin32/Excel COM is required for recalculation")
-
-    excel = win32.DispatchEx("Excel.Application")
-    excel.Visible = False
-    excel.DisplayAlerts = False
-
-    wb = None
-    try:
-        wb = excel.Workbooks.Open(str(workbook_path))
-        excel.CalculateFullRebuild()
-        wb.Save()
-    finally:
-        if wb is not None:
-            wb.Close(SaveChanges=True)
-        excel.Quit()
 
+    def __init__(self):
+        if win32 is None:
+            raise RuntimeError("pywin32/Excel COM is required for recalculation")
+        self.excel = None
+        self._scratch = None
+
+    def __enter__(self) -> "ExcelSession":
+        self.excel = win32.DispatchEx("Excel.Application")
+        try:
+            self.excel.Visible = False
+            self.excel.DisplayAlerts = False
+            self.excel.ScreenUpdating = False
+            self.excel.EnableEvents = False
+            # Excel only accepts a calculation mode while a workbook is open
+            self._scratch = self.excel.Workbooks.Add()
+            self.excel.Calculation = XL_CALCULATION_MANUAL
+            # Every attribute lookup on a COM object is a cross-process call;
+            # resolve the per-workbook methods once for the whole session
+            self._open = self.excel.Workbooks.Open
+            self._calculate_full = self.excel.CalculateFull
+            self._calculate_full_rebuild = self.excel.CalculateFullRebuild
+        except Exception:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.excel is None:
+            return
+        try:
+            if self._scratch is not None:
+                self._scratch.Close(SaveChanges=False)
+        finally:
+            self._scratch = None
+            self._open = None
+            self._calculate_full = None
+            self._calculate_full_rebuild = None
+            self.excel.Quit()
+            self.excel = None
+
+    def recalc(self, workbook_path: Path, full_rebuild: bool = False) -> None:
+        """
+        Recalculate formulas (including UDFs) in one workbook and save it.
+
+        The session runs in manual calculation mode, so opening a workbook evaluates
+        nothing and CalculateFull() below is the single full pass. Pass
+        full_rebuild=True to also rebuild the dependency tree, e.g. when the
+        workbook's UDF code has changed. Calculation is switched back to automatic
+        before saving because Excel stores the mode in the file.
+        """
+        self.recalc_many([workbook_path], full_rebuild=full_rebuild)
+
+    def recalc_many(self, workbook_paths: Iterable[Path], full_rebuild: bool = False) -> None:
+        """Recalculate and save several workbooks in turn (see recalc)."""
+        if self.excel is None:
+            raise RuntimeError("ExcelSession must be entered before recalculating")
+
+        excel = self.excel
+        open_workbook = self._open
+        calculate = self._calculate_full_rebuild if full_rebuild else self._calculate_full
+        for workbook_path in workbook_paths:
+            wb = None
+            try:
+                wb = open_workbook(
+                    str(workbook_path),
+                    UpdateLinks=0,
+                    ReadOnly=False,
+                    IgnoreReadOnlyRecommended=True,
+                    Notify=False
+                )
+                calculate()
+                excel.Calculation = XL_CALCULATION_AUTOMATIC
+                wb.Save()
+            finally:
+                if wb is not None:
+                    wb.Close(SaveChanges=False)
+                excel.Calculation = XL_CALCULATION_MANUAL
+
+
+def recalculate_workbook(workbook_path: Path, full_rebuild: bool = False) -> None:
+    """
+    Recalculate a single workbook in a short-lived Excel instance.
+    Use ExcelSession directly to recalculate several workbooks in one instance.
+    """
+    with ExcelSession() as session:
+        session.recalc(workbook_path, full_rebuild=full_rebuild)
@@ -15,6 +15,7 @@ from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.utils import get_column_letter
 
 from config import ALLOW_TEMPLATE
+from models.task_schema import INVALID_SHEET_CHARS
 
 try:
     import win32com.client as win32  # type: ignore
@@ -26,6 +27,9 @@ TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates"
 TEMPLATE_FILENAME = "analysis_template.xlsm"
 UDF_MODULE_PATH = Path(__file__).parent / "udf" / "analysis_udf.bas"
 
+# Characters Excel rejects in sheet names, mapped to '_' in one str.translate pass
+_INVALID_SHEET_TABLE = str.maketrans({char: '_' for char in INVALID_SHEET_CHARS})
+
 
 class ExcelTemplateLoader:
     """
@@ -212,14 +216,7 @@ def ensure_macro_workbook(output_path: Path) -> Path:
 
 def sanitize_sheet_name(name: str) -> str:
     """Sanitize sheet name for Excel compatibility."""
-    invalid_chars = ['\\', '/', '*', '?', ':', '[', ']']
-    safe_name = name
-    for char in invalid_chars:
-        safe_name = safe_name.replace(char, '_')
-
-    safe_name = safe_name[:31]
-
-    return safe_name
+    return name.translate(_INVALID_SHEET_TABLE)[:31]
 
 
 def get_column_range(
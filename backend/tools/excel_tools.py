@@ -3,110 +3,528 @@ Excel tools for PhD Survey Analyzer.
 CRITICAL: All cells contain FORMULAS, never hardcoded values.
 """
 
+from contextlib import contextmanager
+from functools import wraps
+import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+import re
+import weakref
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Any, TextIO, Tuple, Union
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, Protection
-from openpyxl.utils import get_column_letter
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils.cell import coordinate_to_tuple
+
+try:
+    import xlsxwriter  # type: ignore
+except Exception:
+    xlsxwriter = None
+
+
+_A1_RE = re.compile(r"([A-Za-z]{1,3})(\d+)")
+
+# Letters for every Excel column (A..XFD); COLUMN_LETTERS[i - 1] is column i
+COLUMN_LETTERS = tuple(get_column_letter(i) for i in range(1, 16385))
+
+# Codebook statistics: (output column, formula template); {r} is the
+# variable's data range and {n} the number of data rows
+CODEBOOK_TEMPLATES = (
+    (3, "=COUNT({r})"),
+    (4, "=COUNTBLANK({r})"),
+    (5, "=ROUND(COUNTBLANK({r})/{n}*100,1)"),
+    (6, "=MIN({r})"),
+    (7, "=MAX({r})"),
+    (8, '=IFERROR(ROUND(AVERAGE({r}),2),"N/A")'),
+)
+
+# openpyxl styles are immutable, so one instance can be shared by every cell.
+# Colors are full ARGB: a 6-digit value is stored with a 00 (transparent) alpha.
+HEADER_FONT = Font(bold=True)
+HEADER_FILL = PatternFill(start_color="FFDDEEFF", end_color="FFDDEEFF", fill_type="solid")
+TITLE_FONT = Font(bold=True, size=14)
+APA_ITALIC = Font(italic=True)
+_THIN = Side(style='thin', color='FF000000')
+BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+
+
+class BufferedSheet:
+    """
+    Random-access front for a write-only worksheet.
+
+    Supports the subset of the Worksheet API used by ExcelFormulaWorkbook
+    (ws[cell] = value, ws.cell(row=, column=, value=) and sheet-level
+    settings). Cells are held as WriteOnlyCells and streamed out row by row
+    on flush(); rows already appended directly to the sheet stay first.
+    """
+
+    def __init__(self, ws: WriteOnlyWorksheet):
+        self.ws = ws
+        self._cells: Dict[Tuple[int, int], Cell] = {}
+        self._rows_written = 0
+
+    @property
+    def title(self) -> str:
+        return self.ws.title
+
+    @property
+    def protection(self):
+        return self.ws.protection
+
+    @property
+    def freeze_panes(self):
+        return self.ws.freeze_panes
+
+    @freeze_panes.setter
+    def freeze_panes(self, value) -> None:
+        # Sheet views are serialised with the first row, so set this first
+        self.ws.freeze_panes = value
+
+    def hide_column(self, letter: str) -> None:
+        """Hide a column; like freeze_panes, only effective before the first row is written."""
+        self.ws.column_dimensions[letter].hidden = True
+
+    def append(self, row: List[Any], font: Optional[Font] = None, fill: Optional[PatternFill] = None) -> None:
+        """Stream a row straight to the sheet, ahead of any buffered cells."""
+        if self._cells:
+            raise RuntimeError("Rows must be appended before cells are buffered")
+        if font is not None or fill is not None:
+            row = [self._styled(value, font, fill) for value in row]
+        self.ws.append(row)
+        self._rows_written += 1
+
+    def _styled(self, value: Any, font: Optional[Font], fill: Optional[PatternFill]) -> Cell:
+        cell = WriteOnlyCell(self.ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
+
+    def cell(self, row: int, column: int, value: Any = None) -> Cell:
+        if row <= self._rows_written:
+            raise ValueError(f"Row {row} of '{self.title}' has already been written")
+        cell = self._cells.get((row, column))
+        if cell is None:
+            cell = self._cells[(row, column)] = WriteOnlyCell(self.ws)
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def __setitem__(self, coordinate: str, value: Any) -> None:
+        row, column = coordinate_to_tuple(coordinate)
+        self.cell(row=row, column=column, value=value)
+
+    def flush(self) -> None:
+        """Write buffered cells to the sheet in row order."""
+        rows: Dict[int, Dict[int, Cell]] = {}
+        for (row, column), cell in self._cells.items():
+            rows.setdefault(row, {})[column] = cell
+        for row in sorted(rows):
+            while self._rows_written < row - 1:
+                self.ws.append([])
+                self._rows_written += 1
+            cells = rows[row]
+            self.ws.append([cells.get(column) for column in range(1, max(cells) + 1)])
+            self._rows_written += 1
+        self._cells.clear()
+
+
+class _PendingCell:
+    """Value and openpyxl-style font/fill for a cell not yet written by xlsxwriter."""
+    __slots__ = ("value", "font", "fill")
+
+    def __init__(self, value: Any = None):
+        self.value = value
+        self.font: Optional[Font] = None
+        self.fill: Optional[PatternFill] = None
+
+
+class _XlsxWriterProtection:
+    """openpyxl-style protection settings applied to an xlsxwriter sheet."""
+
+    def __init__(self, ws):
+        self._ws = ws
+        self._sheet = False
+        self._password: Optional[str] = None
+
+    def _apply(self) -> None:
+        if self._sheet:
+            self._ws.protect(self._password or "")
+
+    @property
+    def sheet(self) -> bool:
+        return self._sheet
+
+    @sheet.setter
+    def sheet(self, value: bool) -> None:
+        self._sheet = bool(value)
+        self._apply()
+
+    @property
+    def password(self) -> Optional[str]:
+        return self._password
+
+    @password.setter
+    def password(self, value: Optional[str]) -> None:
+        self._password = value
+        self._apply()
+
+    def enable(self) -> None:
+        self.sheet = True
+
+
+class XlsxWriterSheet:
+    """
+    Counterpart of BufferedSheet backed by an xlsxwriter worksheet.
+    Implements the same small sheet protocol (title, protection,
+    freeze_panes, hide_column, append, cell, ws[cell] = value, flush).
+
+    The workbook runs in constant_memory mode, so appended rows are flushed
+    to disk as they are written and buffered cells go out in row order on
+    flush(). openpyxl Font/PatternFill values are translated to cached
+    xlsxwriter formats.
+    """
+
+    def __init__(self, ws, add_format, formats: Dict[Tuple[Any, Any], Any]):
+        self.ws = ws
+        self._cells: Dict[Tuple[int, int], _PendingCell] = {}
+        self._rows_written = 0
+        self._add_format = add_format
+        self._formats = formats
+        self._protection = _XlsxWriterProtection(ws)
+        self._freeze_panes: Optional[str] = None
+
+    @property
+    def title(self) -> str:
+        return self.ws.name
+
+    @property
+    def protection(self) -> _XlsxWriterProtection:
+        return self._protection
+
+    @property
+    def freeze_panes(self) -> Optional[str]:
+        return self._freeze_panes
+
+    @freeze_panes.setter
+    def freeze_panes(self, value: Optional[str]) -> None:
+        self._freeze_panes = value
+        if value:
+            self.ws.freeze_panes(value)
+
+    def hide_column(self, letter: str) -> None:
+        """Hide a column."""
+        index = column_index_from_string(letter) - 1
+        self.ws.set_column(index, index, None, None, {"hidden": True})
+
+    def _format(self, font: Optional[Font], fill: Optional[PatternFill]):
+        if font is None and fill is None:
+            return None
+        key = (font, fill)
+        fmt = self._formats.get(key)
+        if fmt is None:
+            props: Dict[str, Any] = {}
+            if font is not None:
+                props.update(bold=bool(font.b), italic=bool(font.i))
+                if font.sz:
+                    props["font_size"] = font.sz
+            if fill is not None and fill.fill_type == "solid":
+                props.update(pattern=1, bg_color=f"#{fill.fgColor.rgb[-6:]}")
+            fmt = self._formats[key] = self._add_format(props)
+        return fmt
+
+    def append(self, row: List[Any], font: Optional[Font] = None, fill: Optional[PatternFill] = None) -> None:
+        """Stream a row straight to the sheet, ahead of any buffered cells."""
+        if self._cells:
+            raise RuntimeError("Rows must be appended before cells are buffered")
+        self.ws.write_row(self._rows_written, 0, row, self._format(font, fill))
+        self._rows_written += 1
+
+    def cell(self, row: int, column: int, value: Any = None) -> _PendingCell:
+        if row <= self._rows_written:
+            raise ValueError(f"Row {row} of '{self.title}' has already been written")
+        cell = self._cells.get((row, column))
+        if cell is None:
+            cell = self._cells[(row, column)] = _PendingCell()
+        if value is not None:
+            cell.value = value
+        return cell
+
+    def __setitem__(self, coordinate: str, value: Any) -> None:
+        row, column = coordinate_to_tuple(coordinate)
+        self.cell(row=row, column=column, value=value)
+
+    def flush(self) -> None:
+        """Write buffered cells to the sheet in row order."""
+        for row, column in sorted(self._cells):
+            cell = self._cells[(row, column)]
+            fmt = self._format(cell.font, cell.fill)
+            if cell.value is None:
+                if fmt is not None:
+                    self.ws.write_blank(row - 1, column - 1, None, fmt)
+            else:
+                self.ws.write(row - 1, column - 1, cell.value, fmt)
+        if self._cells:
+            self._rows_written = max(row for row, _ in self._cells)
+        self._cells.clear()
+
+
+StreamingSheet = Union[BufferedSheet, XlsxWriterSheet]
+SheetLike = Union[Worksheet, BufferedSheet, XlsxWriterSheet]
+
+
+class FormulaLogEntry(NamedTuple):
+    """One audited formula write."""
+    sheet: str
+    cell: str
+    formula: str
+    timestamp: str
+
+
+def _formula_batch(method):
+    """Run a multi-formula writer inside ExcelFormulaWorkbook.formula_batch()."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.formula_batch():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class ExcelFormulaWorkbook:
     """
     Excel workbook manager that enforces formula-only output.
     NEVER writes literal values - only formulas.
+
+    By default the workbook is write-only: raw data is streamed with
+    ws.append() and formula sheets are buffered (see BufferedSheet) until
+    save(), keeping memory flat for large surveys. When xlsxwriter is
+    installed, write-only workbooks are written by it in constant_memory
+    mode (engine="xlsxwriter"); pass engine="openpyxl" to force openpyxl.
+
+    The formula audit log is streamed to a JSONL sidecar next to the
+    workbook (<output>.formulas.jsonl, see formula_log_path) instead of
+    being held in memory. The file is created on the first formula write
+    and kept as the audit trail after save(). Use the workbook as a context
+    manager, or call close(), if it may not be saved.
     """
     
-    def __init__(self, output_path: Path):
+    def __init__(self, output_path: Path, write_only: bool = True, engine: Optional[str] = None):
         self.output_path = output_path
-        self.workbook = Workbook()
-        self.workbook.remove(self.workbook.active)
-        
-        self.header_font = Font(bold=True)
-        self.header_fill = PatternFill(start_color="DDEEFF", end_color="DDEEFF", fill_type="solid")
-        self.title_font = Font(bold=True, size=14)
-        self.apa_italic = Font(italic=True)
+        self.write_only = write_only
+        if engine is None:
+            engine = "xlsxwriter" if write_only and xlsxwriter is not None else "openpyxl"
+        if engine == "xlsxwriter" and (xlsxwriter is None or not write_only):
+            raise ValueError("engine='xlsxwriter' requires xlsxwriter and write_only=True")
+        self.engine = engine
+        self._formats: Dict[Tuple[Any, Any], Any] = {}
+        if engine == "xlsxwriter":
+            self.workbook = xlsxwriter.Workbook(str(output_path), {
+                "constant_memory": True,
+                "strings_to_urls": False,
+                "nan_inf_to_errors": True,
+                "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            })
+        else:
+            self.workbook = Workbook(write_only=write_only)
+            if not write_only:
+                self.workbook.remove(self.workbook.active)
         
-        thin = Side(style='thin', color='000000')
-        self.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        self.header_font = HEADER_FONT
+        self.header_fill = HEADER_FILL
+        self.title_font = TITLE_FONT
+        self.apa_italic = APA_ITALIC
+        self.border = BORDER
         
-        self.formula_log: List[Dict[str, str]] = []
+        self.formula_log_path = Path(output_path).with_suffix(".formulas.jsonl")
+        self._log_fh: Optional[TextIO] = None
+        self.formula_count = 0
         self.sheets_created: List[str] = []
+        self._buffered_sheets: List[StreamingSheet] = []
+        self._batch_ts: Optional[str] = None
     
-    def create_sheet(self, name: str) -> Worksheet:
+    def create_sheet(self, name: str) -> SheetLike:
         """Create a new worksheet."""
-        ws = self.workbook.create_sheet(name)
         self.sheets_created.append(name)
+        if self.engine == "xlsxwriter":
+            ws = XlsxWriterSheet(self.workbook.add_worksheet(name), self.workbook.add_format, self._formats)
+            self._buffered_sheets.append(ws)
+            return ws
+        ws = self.workbook.create_sheet(name)
+        if self.write_only:
+            ws = BufferedSheet(ws)
+            self._buffered_sheets.append(ws)
         return ws
     
-    def write_formula(self, ws: Worksheet, cell: str, formula: str, doc_col: Optional[int] = None) -> None:
+    @contextmanager
+    def formula_batch(self) -> Iterator[None]:
+        """Stamp every formula written inside the block with one shared timestamp."""
+        if self._batch_ts is not None:
+            yield
+            return
+        self._batch_ts = datetime.now().isoformat()
+        try:
+            yield
+        finally:
+            self._batch_ts = None
+    
+    def write_formula(
+        self,
+        ws: SheetLike,
+        cell: Union[str, Tuple[int, int]],
+        formula: str,
+        doc_col: Optional[int] = None
+    ) -> None:
         """
         Write a FORMULA to a cell.
         
         Args:
             ws: Worksheet
-            cell: Cell reference (e.g., "B2")
+            cell: Cell reference (e.g., "B2") or a (row, column) tuple
             formula: Excel formula starting with "="
             doc_col: Optional column number for formula documentation
         """
         if not formula.startswith("="):
             raise ValueError(f"REJECTED: '{formula}' is not a formula. Must start with '='")
         
-        ws[cell] = formula
+        row, column, cell = self._resolve_cell(cell)
+        
+        # In write-only mode the cell lands in the sheet's row buffer and is
+        # streamed out with ws.append on save()
+        ws.cell(row=row, column=column, value=formula)
         
-        self.formula_log.append({
-            "sheet": ws.title,
-            "cell": cell,
-            "formula": formula,
-            "timestamp": datetime.now().isoformat()
-        })
+        self._log_formulas([FormulaLogEntry(
+            ws.title, cell, formula, self._batch_ts or datetime.now().isoformat()
+        )])
         
         if doc_col:
-            row = int(''.join(filter(str.isdigit, cell)))
             ws.cell(row=row, column=doc_col, value=formula)
     
-    def write_raw_data(self, ws: Worksheet, df: pd.DataFrame) -> None:
+    @staticmethod
+    def _resolve_cell(cell: Union[str, Tuple[int, int]]) -> Tuple[int, int, str]:
+        """Return (row, column, A1 reference) for a cell given either way."""
+        if isinstance(cell, tuple):
+            row, column = cell
+            return row, column, f"{COLUMN_LETTERS[column - 1]}{row}"
+        match = _A1_RE.fullmatch(cell)
+        if not match:
+            raise ValueError(f"Invalid cell reference: '{cell}'")
+        return int(match.group(2)), column_index_from_string(match.group(1).upper()), cell
+    
+    def write_formulas_bulk(
+        self,
+        ws: SheetLike,
+        items: Iterable[Tuple[Union[str, Tuple[int, int]], str]]
+    ) -> None:
         """
-        Write raw data to sheet (the ONLY place we write actual values).
-        This is the source data that all formulas reference.
+        Write many FORMULAS at once.
+        
+        Every formula is validated before any cell is touched, so a bad
+        entry leaves the sheet unchanged. All entries share one log timestamp.
+        
+        Args:
+            ws: Worksheet
+            items: (cell, formula) pairs; cells as in write_formula
         """
-        for c_idx, col in enumerate(df.columns, 1):
-            cell = ws.cell(row=1, column=c_idx, value=col)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
+        items = list(items)
+        for _, formula in items:
+            if not formula.startswith("="):
+                raise ValueError(f"REJECTED: '{formula}' is not a formula. Must start with '='")
         
-        for r_idx, row in enumerate(df.itertuples(index=False), 2):
-            for c_idx, value in enumerate(row, 1):
-                if pd.isna(value):
-                    ws.cell(row=r_idx, column=c_idx, value="")
-                else:
-                    ws.cell(row=r_idx, column=c_idx, value=value)
+        resolved = [(self._resolve_cell(cell), formula) for cell, formula in items]
+        for (row, column, _), formula in resolved:
+            ws.cell(row=row, column=column, value=formula)
         
+        timestamp = self._batch_ts or datetime.now().isoformat()
+        title = ws.title
+        self._log_formulas([
+            FormulaLogEntry(title, ref, formula, timestamp) for (_, _, ref), formula in resolved
+        ])
+    
+    def _log_formulas(self, entries: List[FormulaLogEntry]) -> None:
+        """Append entries to the formula audit log sidecar."""
+        if self._log_fh is None:
+            # Truncate on the first write of this workbook, append after a close
+            mode = "a" if self.formula_count else "w"
+            self._log_fh = open(self.formula_log_path, mode, encoding="utf-8", buffering=1 << 16)
+            # Closes the handle if the workbook is dropped without save()/close()
+            self._log_finalizer = weakref.finalize(self, self._log_fh.close)
+        self._log_fh.write("".join(json.dumps(entry._asdict()) + "\n" for entry in entries))
+        self.formula_count += len(entries)
+    
+    def close(self) -> None:
+        """Close the formula log sidecar; it is reopened if more formulas are written."""
+        if self._log_fh is not None:
+            self._log_finalizer()
+            self._log_fh = None
+    
+    def __enter__(self) -> "ExcelFormulaWorkbook":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def write_raw_data(self, ws: SheetLike, df: pd.DataFrame) -> None:
+        """
+        Write raw data to sheet (the ONLY place we write actual values).
+        This is the source data that all formulas reference.
+        """
+        # Sheet-level settings go first: protection is a single sheet flag
+        # (cells keep openpyxl's default locked style), so no per-cell work
         ws.freeze_panes = "A2"
-        
         ws.protection.sheet = True
         ws.protection.password = "locked"
-        ws.protection.enable()
+        
+        # Blank missing values with one vectorised pass per column rather than
+        # a pd.isna() call per cell; plain int/bool columns cannot hold NaN
+        values = df.to_numpy(dtype=object)
+        for c_idx, dtype in enumerate(df.dtypes):
+            if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+                continue
+            missing = df.iloc[:, c_idx].isna().to_numpy()
+            if missing.any():
+                values[missing, c_idx] = ""
+        
+        if isinstance(ws, (BufferedSheet, XlsxWriterSheet)):
+            ws.append(list(df.columns), font=self.header_font, fill=self.header_fill)
+        else:
+            ws.append(list(df.columns))
+            for cell in ws[1]:
+                cell.font = self.header_font
+                cell.fill = self.header_fill
+        
+        for row in values.tolist():
+            ws.append(row)
     
-    def write_header_row(self, ws: Worksheet, headers: List[str], row: int = 1) -> None:
+    def write_header_row(self, ws: SheetLike, headers: List[str], row: int = 1) -> None:
         """Write formatted header row."""
         for c_idx, header in enumerate(headers, 1):
             cell = ws.cell(row=row, column=c_idx, value=header)
             cell.font = self.header_font
             cell.fill = self.header_fill
     
-    def write_title(self, ws: Worksheet, title: str, row: int = 1) -> None:
+    def hide_column(self, ws: SheetLike, letter: str) -> None:
+        """Hide a helper column on any sheet kind."""
+        if isinstance(ws, (BufferedSheet, XlsxWriterSheet)):
+            ws.hide_column(letter)
+        else:
+            ws.column_dimensions[letter].hidden = True
+    
+    def write_title(self, ws: SheetLike, title: str, row: int = 1) -> None:
         """Write sheet title."""
         cell = ws.cell(row=row, column=1, value=title)
         cell.font = self.title_font
     
+    @_formula_batch
     def write_descriptives_formulas(
         self,
-        ws: Worksheet,
+        ws: SheetLike,
         variables: List[str],
         raw_sheet: str,
         col_mapping: Dict[str, str],
@@ -125,8 +543,10 @@ class ExcelFormulaWorkbook:
             start_row: Row to start writing
         """
         headers = ["Variable", "N", "M", "SD", "SE", "Median", "Min", "Max", 
-                   "Skew", "Kurt", "95% CI Lower", "95% CI Upper", "Formula Doc"]
+                   "Skew", "Kurt", "95% CI Lower", "95% CI Upper", "Formula Doc", "SE (unrounded)"]
         self.write_header_row(ws, headers, start_row)
+        # Column N holds the unrounded SE that E, K and L reference; keep it out of view
+        self.hide_column(ws, "N")
         
         row = start_row + 1
         for var in variables:
@@ -135,28 +555,37 @@ class ExcelFormulaWorkbook:
                 continue
             
             data_range = f"'{raw_sheet}'!{col_letter}2:{col_letter}{n_rows + 1}"
+            count_f = f"COUNT({data_range})"
+            avg_f = f"AVERAGE({data_range})"
+            sd_f = f"STDEV.S({data_range})"
+            se_f = f"{sd_f}/SQRT({count_f})"
             
             ws.cell(row=row, column=1, value=var)
             
-            self.write_formula(ws, f"B{row}", f"=COUNT({data_range})")
-            self.write_formula(ws, f"C{row}", f"=ROUND(AVERAGE({data_range}),2)")
-            self.write_formula(ws, f"D{row}", f"=ROUND(STDEV.S({data_range}),2)")
-            self.write_formula(ws, f"E{row}", f"=ROUND(STDEV.S({data_range})/SQRT(COUNT({data_range})),3)")
-            self.write_formula(ws, f"F{row}", f"=ROUND(MEDIAN({data_range}),2)")
-            self.write_formula(ws, f"G{row}", f"=MIN({data_range})")
-            self.write_formula(ws, f"H{row}", f"=MAX({data_range})")
-            self.write_formula(ws, f"I{row}", f"=ROUND(SKEW({data_range}),2)")
-            self.write_formula(ws, f"J{row}", f"=ROUND(KURT({data_range}),2)")
-            self.write_formula(ws, f"K{row}", f"=ROUND(AVERAGE({data_range})-1.96*STDEV.S({data_range})/SQRT(COUNT({data_range})),2)")
-            self.write_formula(ws, f"L{row}", f"=ROUND(AVERAGE({data_range})+1.96*STDEV.S({data_range})/SQRT(COUNT({data_range})),2)")
+            self.write_formulas_bulk(ws, [
+                (f"B{row}", f"={count_f}"),
+                (f"C{row}", f"=ROUND({avg_f},2)"),
+                (f"D{row}", f"=ROUND({sd_f},2)"),
+                (f"E{row}", f"=ROUND(N{row},3)"),
+                (f"F{row}", f"=ROUND(MEDIAN({data_range}),2)"),
+                (f"G{row}", f"=MIN({data_range})"),
+                (f"H{row}", f"=MAX({data_range})"),
+                (f"I{row}", f"=ROUND(SKEW({data_range}),2)"),
+                (f"J{row}", f"=ROUND(KURT({data_range}),2)"),
+                # CI bounds reuse the SE helper in column N so Excel evaluates it once per row
+                (f"K{row}", f"=ROUND({avg_f}-1.96*N{row},2)"),
+                (f"L{row}", f"=ROUND({avg_f}+1.96*N{row},2)"),
+                (f"N{row}", f"={se_f}"),
+            ])
             
             ws.cell(row=row, column=13, value=f"AVERAGE/STDEV.S/etc({data_range})")
             
             row += 1
     
+    @_formula_batch
     def write_codebook_formulas(
         self,
-        ws: Worksheet,
+        ws: SheetLike,
         columns: List[str],
         raw_sheet: str,
         n_rows: int
@@ -169,33 +598,35 @@ class ExcelFormulaWorkbook:
         headers = ["Variable", "Column", "N Valid", "N Missing", "% Missing", "Min", "Max", "Mean", "Formula"]
         self.write_header_row(ws, headers, 5)
         
-        row = 6
-        for c_idx, col in enumerate(columns, 1):
-            col_letter = get_column_letter(c_idx)
-            data_range = f"'{raw_sheet}'!{col_letter}2:{col_letter}{n_rows + 1}"
+        last_row = n_rows + 1
+        letters = list(zip(columns, COLUMN_LETTERS))
+        for row, (col, col_letter) in enumerate(letters, 6):
+            data_range = f"'{raw_sheet}'!{col_letter}2:{col_letter}{last_row}"
             
             ws.cell(row=row, column=1, value=col)
             ws.cell(row=row, column=2, value=col_letter)
             
-            self.write_formula(ws, f"C{row}", f"=COUNT({data_range})")
-            self.write_formula(ws, f"D{row}", f"=COUNTBLANK({data_range})")
-            self.write_formula(ws, f"E{row}", f"=ROUND(COUNTBLANK({data_range})/{n_rows}*100,1)")
-            self.write_formula(ws, f"F{row}", f"=MIN({data_range})")
-            self.write_formula(ws, f"G{row}", f"=MAX({data_range})")
-            self.write_formula(ws, f"H{row}", f"=IFERROR(ROUND(AVERAGE({data_range}),2),\"N/A\")")
+            for column, template in CODEBOOK_TEMPLATES:
+                self.write_formula(ws, (row, column), template.format(r=data_range, n=n_rows))
             
             ws.cell(row=row, column=9, value=f"COUNT/COUNTBLANK({data_range})")
-            row += 1
     
+    @_formula_batch
     def write_correlation_matrix_formulas(
         self,
-        ws: Worksheet,
+        ws: SheetLike,
         variables: List[str],
         raw_sheet: str,
         col_mapping: Dict[str, str],
-        n_rows: int
+        n_rows: int,
+        df: Optional[pd.DataFrame] = None
     ) -> None:
-        """Write correlation matrix using CORREL formulas."""
+        """
+        Write correlation matrix using CORREL formulas.
+        
+        When the source DataFrame is given, pairs involving a constant
+        column get ="N/A" instead of a CORREL that can only be #DIV/0!.
+        """
         self.write_title(ws, "CORRELATION MATRIX")
         ws.cell(row=2, column=1, value="Pearson r computed via =CORREL() formula")
         ws.cell(row=3, column=1, value="* p < .05, ** p < .01")
@@ -205,27 +636,41 @@ class ExcelFormulaWorkbook:
             ws.cell(row=start_row, column=i, value=var).font = self.header_font
             ws.cell(row=start_row + i - 1, column=1, value=var).font = self.header_font
         
-        for i, var1 in enumerate(variables):
-            row = start_row + 1 + i
-            col1_letter = col_mapping.get(var1)
-            if not col1_letter:
+        letters = COLUMN_LETTERS[1:len(variables) + 1]
+        # Each variable's range string is built once and reused for every pair
+        ranges = [
+            f"'{raw_sheet}'!{letter}2:{letter}{n_rows + 1}" if letter else None
+            for letter in (col_mapping.get(var) for var in variables)
+        ]
+        constant = [False] * len(variables)
+        if df is not None:
+            present = [var for var in variables if var in df.columns]
+            n_unique = df[present].nunique()
+            constant = [var in n_unique.index and n_unique[var] <= 1 for var in variables]
+        
+        items: List[Tuple[Tuple[int, int], str]] = []
+        for i, range1 in enumerate(ranges):
+            if range1 is None:
                 continue
-            range1 = f"'{raw_sheet}'!{col1_letter}2:{col1_letter}{n_rows + 1}"
+            row = start_row + 1 + i
             
-            for j, var2 in enumerate(variables):
-                col = j + 2
-                col2_letter = col_mapping.get(var2)
-                if not col2_letter:
+            for j, range2 in enumerate(ranges):
+                if range2 is None:
                     continue
-                range2 = f"'{raw_sheet}'!{col2_letter}2:{col2_letter}{n_rows + 1}"
                 
-                if var1 == var2:
-                    ws.cell(row=row, column=col, value="1.00")
+                cell_ref = (row, j + 2)
+                if j == i:
+                    items.append((cell_ref, "=1"))
+                elif j < i:
+                    # Lower triangle mirrors the upper one; CORREL is symmetric
+                    items.append((cell_ref, f"={letters[i]}{start_row + 1 + j}"))
+                elif constant[i] or constant[j]:
+                    items.append((cell_ref, '="N/A"'))
                 else:
-                    self.write_formula(ws, f"{get_column_letter(col)}{row}", 
-                                      f"=ROUND(CORREL({range1},{range2}),2)")
+                    items.append((cell_ref, f"=ROUND(CORREL({range1},{range2}),2)"))
+        self.write_formulas_bulk(ws, items)
     
-    def write_text_content(self, ws: Worksheet, title: str, content: str, start_row: int = 1) -> None:
+    def write_text_content(self, ws: SheetLike, title: str, content: str, start_row: int = 1) -> None:
         """Write text content to sheet."""
         self.write_title(ws, title, start_row)
         ws.cell(row=start_row + 1, column=1, value=f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -237,14 +682,37 @@ class ExcelFormulaWorkbook:
     
     def save(self) -> Path:
         """Save workbook and return path."""
-        self.workbook.save(self.output_path)
+        try:
+            for ws in self._buffered_sheets:
+                ws.flush()
+            if self.engine == "xlsxwriter":
+                self.workbook.close()
+            else:
+                self.workbook.save(self.output_path)
+        finally:
+            self.close()
         return self.output_path
     
+    @property
+    def formula_log(self) -> List[Dict[str, str]]:
+        """Complete formula audit log (read back from the sidecar)."""
+        return self.get_formula_log()
+    
+    def iter_formula_log(self) -> Iterator[Dict[str, str]]:
+        """Yield the formula audit log one entry at a time."""
+        if not self.formula_count:
+            return
+        if self._log_fh is not None:
+            self._log_fh.flush()
+        with open(self.formula_log_path, encoding="utf-8") as fh:
+            for line in fh:
+                yield json.loads(line)
+    
     def get_formula_log(self) -> List[Dict[str, str]]:
         """Return complete formula audit log."""
-        return self.formula_log
+        return list(self.iter_formula_log())
 
 
 def get_column_mapping(df: pd.DataFrame) -> Dict[str, str]:
     """Create mapping of column names to Excel column letters."""
-    return {col: get_column_letter(idx + 1) for idx, col in enumerate(df.columns)}
+    return dict(zip(df.columns, COLUMN_LETTERS))
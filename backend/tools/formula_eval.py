@@ -0,0 +1,166 @@
+"""
+Pure-Python formula evaluation.
+Evaluates FormulaEngine output cells without launching Excel, so verification
+can run where Excel + pywin32 are unavailable. Cells built on VBA UDFs are not
+supported and must still be recalculated through tools.excel_com.
+Requires pycel.
+
+The lower-case functions below are pycel plugins: Excel statistical functions
+that FormulaEngine emits but pycel does not ship (STDEV.S becomes stdev_s).
+"""
+
+import math
+from pathlib import Path
+from typing import Any, List, Union
+
+import numpy as np
+from scipy import stats
+
+try:
+    from pycel import ExcelCompiler  # type: ignore
+except Exception:
+    ExcelCompiler = None
+
+
+DIV0 = "#DIV/0!"
+NA_ERROR = "#N/A"
+NUM_ERROR = "#NUM!"
+EXCEL_ERRORS = frozenset({DIV0, NA_ERROR, NUM_ERROR, "#NAME?", "#NULL!", "#REF!", "#VALUE!"})
+
+
+class UnsupportedFormulaError(RuntimeError):
+    """Raised when a cell cannot be evaluated without Excel (e.g. VBA UDFs)."""
+
+
+def _flatten(args) -> List[Any]:
+    values: List[Any] = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            values.extend(_flatten(arg))
+        else:
+            values.append(arg)
+    return values
+
+
+def _numbers(*args) -> Union[List[float], str]:
+    """Numeric values as Excel's statistical functions see them, or the first error code."""
+    numbers = []
+    for value in _flatten(args):
+        if isinstance(value, str) and value in EXCEL_ERRORS:
+            return value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            numbers.append(float(value))
+    return numbers
+
+
+def stdev_s(*args):
+    data = _numbers(*args)
+    if isinstance(data, str):
+        return data
+    if len(data) < 2:
+        return DIV0
+    return float(np.std(data, ddof=1))
+
+
+def var_s(*args):
+    data = _numbers(*args)
+    if isinstance(data, str):
+        return data
+    if len(data) < 2:
+        return DIV0
+    return float(np.var(data, ddof=1))
+
+
+def median(*args):
+    data = _numbers(*args)
+    if isinstance(data, str):
+        return data
+    if not data:
+        return NUM_ERROR
+    return float(np.median(data))
+
+
+def skew(*args):
+    data = _numbers(*args)
+    if isinstance(data, str):
+        return data
+    if len(data) < 3 or np.std(data) == 0:
+        return DIV0
+    return float(stats.skew(data, bias=False))
+
+
+def kurt(*args):
+    data = _numbers(*args)
+    if isinstance(data, str):
+        return data
+    if len(data) < 4 or np.std(data) == 0:
+        return DIV0
+    return float(stats.kurtosis(data, bias=False))
+
+
+def correl(array1, array2):
+    xs, ys = _flatten([array1]), _flatten([array2])
+    if len(xs) != len(ys):
+        return NA_ERROR
+    pairs = []
+    for x, y in zip(xs, ys):
+        for value in (x, y):
+            if isinstance(value, str) and value in EXCEL_ERRORS:
+                return value
+        if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (x, y)):
+            pairs.append((float(x), float(y)))
+    if len(pairs) < 2:
+        return DIV0
+    x_arr, y_arr = np.array(pairs).T
+    if np.std(x_arr) == 0 or np.std(y_arr) == 0:
+        return DIV0
+    return float(np.corrcoef(x_arr, y_arr)[0, 1])
+
+
+def countblank(rng):
+    return sum(1 for value in _flatten([rng]) if value is None or value == "")
+
+
+def counta(*args):
+    return sum(1 for value in _flatten(args) if value is not None and value != "")
+
+
+def rows(rng):
+    return len(rng) if isinstance(rng, (list, tuple)) else 1
+
+
+def chisq_dist_rt(x, deg_freedom):
+    if isinstance(x, str) or isinstance(deg_freedom, str):
+        return x if isinstance(x, str) else deg_freedom
+    if x < 0 or deg_freedom < 1:
+        return NUM_ERROR
+    return float(stats.chi2.sf(x, int(deg_freedom)))
+
+
+class FormulaEvaluator:
+    """
+    Evaluates workbook cells from their formulas using pycel.
+    """
+
+    def __init__(self, workbook_path: Path):
+        if ExcelCompiler is None:
+            raise RuntimeError("pycel is required for Python formula evaluation")
+        self._compiler = ExcelCompiler(filename=str(workbook_path), plugins=[__name__])
+
+    def evaluate(self, sheet_name: str, cell_ref: str) -> Any:
+        """
+        Evaluate one cell.
+
+        Raises:
+            UnsupportedFormulaError: The formula (or a precedent) uses a
+                function pycel cannot evaluate.
+        """
+        try:
+            value = self._compiler.evaluate(f"{sheet_name}!{cell_ref}")
+        except Exception as e:
+            raise UnsupportedFormulaError(f"{sheet_name}!{cell_ref}: {type(e).__name__}") from e
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            raise UnsupportedFormulaError(f"{sheet_name}!{cell_ref}: evaluated to NaN")
+        return value
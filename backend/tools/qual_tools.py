@@ -4,21 +4,35 @@ Automated codebook creation, coding, and inter-rater reliability.
 Supports both keyword-based and LLM-based coding for PhD-level validity.
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from collections import Counter
+from functools import lru_cache
+from itertools import chain
 import re
 import hashlib
 import json
 import asyncio
 
+import numpy as np
 import pandas as pd
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from openpyxl.utils import get_column_letter
 
 from langchain_anthropic import ChatAnthropic
 from langchain_openai import ChatOpenAI
 
+try:
+    import ahocorasick  # type: ignore
+except Exception:
+    ahocorasick = None
+
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None
+
 
 @dataclass
 class Code:
@@ -73,32 +87,109 @@ class CodingResult:
     confidence: float = 1.0
 
 
+def _code_keywords(name: str, examples: Tuple[str, ...]) -> Tuple[List[str], List[str]]:
+    """
+    Lowercase keywords for one code: name words longer than 3 characters
+    (matched as word prefixes) and examples (matched as whole words).
+    """
+    name_words = [word for word in name.lower().split() if len(word) > 3]
+    return name_words, [example.lower() for example in examples]
+
+
+@lru_cache(maxsize=4096)
+def _compile_code_pattern(name: str, examples: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """
+    Build the matching regex for one code, or None if it has no keywords.
+    All keywords are joined into a single alternation, longest first, so
+    each code costs one search per response.
+    Cached so coders built from the same definitions share patterns.
+    """
+    name_words, example_words = _code_keywords(name, examples)
+    alternatives = {}
+    
+    for word in name_words:
+        alternatives[rf'{re.escape(word)}\w*'] = len(word)
+    
+    for example in example_words:
+        alternatives.setdefault(re.escape(example), len(example))
+    
+    if not alternatives:
+        return None
+    
+    ordered = sorted(alternatives, key=alternatives.get, reverse=True)
+    return re.compile(rf'\b(?:{"|".join(ordered)})\b', re.IGNORECASE)
+
+
 class AutomatedCoder:
     """
     Automated qualitative coder using keyword and pattern matching.
     For PhD-level analysis, this should be supplemented with LLM coding.
+    
+    When pyahocorasick is installed, every code's keywords go into one
+    Aho-Corasick automaton that scans each response once; only codes with a
+    keyword hit are then confirmed with their regex (word boundaries).
     """
     
     def __init__(self, codebook: Codebook):
         self.codebook = codebook
-        self.code_patterns: Dict[str, List[re.Pattern]] = {}
+        self.code_patterns: Dict[str, Optional[re.Pattern]] = {}
+        self._automaton = None
+        # Codes with an empty example match any word boundary; always confirm them
+        self._unfiltered_codes: set = set()
         self._compile_patterns()
     
     def _compile_patterns(self) -> None:
-        """Compile regex patterns for each code based on name and examples."""
+        """Compile one regex per code from its name and examples."""
         for code_id, code in self.codebook.codes.items():
-            patterns = []
-            
-            name_words = code.name.lower().split()
-            for word in name_words:
-                if len(word) > 3:
-                    patterns.append(re.compile(rf'\b{re.escape(word)}\w*\b', re.IGNORECASE))
-            
-            for example in code.examples:
-                example_clean = re.escape(example.lower())
-                patterns.append(re.compile(rf'\b{example_clean}\b', re.IGNORECASE))
-            
-            self.code_patterns[code_id] = patterns
+            self.code_patterns[code_id] = _compile_code_pattern(code.name, tuple(code.examples))
+        
+        # Snapshot for the per-response loop; codes without keywords never match
+        self._pattern_items = tuple(
+            (code_id, pattern) for code_id, pattern in self.code_patterns.items()
+            if pattern is not None
+        )
+        
+        if ahocorasick is not None:
+            self._automaton = self._build_automaton()
+    
+    def _build_automaton(self):
+        """Build a keyword -> code ids automaton over all codes."""
+        keyword_codes: Dict[str, set] = {}
+        for code_id, code in self.codebook.codes.items():
+            name_words, example_words = _code_keywords(code.name, tuple(code.examples))
+            for keyword in name_words + example_words:
+                if keyword:
+                    keyword_codes.setdefault(keyword, set()).add(code_id)
+                else:
+                    self._unfiltered_codes.add(code_id)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, code_ids in keyword_codes.items():
+            automaton.add_word(keyword, frozenset(code_ids))
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+    
+    def _match_codes(self, response_text: str) -> List[str]:
+        """Return the ids of codes whose patterns match the text, in codebook order."""
+        if self._automaton is None:
+            return [
+                code_id for code_id, pattern in self._pattern_items
+                if pattern.search(response_text)
+            ]
+        
+        candidates = set(self._unfiltered_codes)
+        n_codes = len(self._pattern_items)
+        for _, code_ids in self._automaton.iter(response_text.lower()):
+            candidates |= code_ids
+            if len(candidates) == n_codes:
+                # Every code is already a candidate; the rest of the scan can't add any
+                break
+        return [
+            code_id for code_id, pattern in self._pattern_items
+            if code_id in candidates and pattern.search(response_text)
+        ]
     
     def code_response(
         self,
@@ -117,16 +208,7 @@ class AutomatedCoder:
         Returns:
             CodingResult with assigned codes.
         """
-        assigned_codes = []
-        
-        for code_id, patterns in self.code_patterns.items():
-            match_count = 0
-            for pattern in patterns:
-                if pattern.search(response_text):
-                    match_count += 1
-            
-            if match_count > 0:
-                assigned_codes.append(code_id)
+        assigned_codes = self._match_codes(response_text)
         
         confidence = min(1.0, len(assigned_codes) / max(len(self.codebook.codes) * 0.1, 1))
         
@@ -156,11 +238,13 @@ class AutomatedCoder:
             List of CodingResults.
         """
         results = []
-        for idx, row in df.iterrows():
-            text = str(row[column]) if pd.notna(row[column]) else ""
+        values = df[column].to_numpy(dtype=object)
+        index = df.index.to_numpy()
+        for i in np.flatnonzero(~pd.isna(values)):
+            text = str(values[i])
             if text and text.lower() != 'nan':
                 result = self.code_response(
-                    response_id=str(idx),
+                    response_id=str(index[i]),
                     response_text=text,
                     coder_id=coder_id
                 )
@@ -337,6 +421,37 @@ If no codes apply, return: {{"codes": [], "confidence": 1.0, "reasoning": "No ap
         return results
 
 
+def _kappa_counts_numpy(coder1_matrix: np.ndarray, coder2_matrix: np.ndarray) -> Tuple[int, int, int]:
+    """Agreements and each coder's positive count over two N x K boolean matrices."""
+    return (
+        int((coder1_matrix == coder2_matrix).sum()),
+        int(coder1_matrix.sum()),
+        int(coder2_matrix.sum())
+    )
+
+
+def _kappa_counts_loop(coder1_matrix, coder2_matrix):
+    """Loop form of _kappa_counts_numpy, compiled with numba when available."""
+    n, k = coder1_matrix.shape
+    agreements = 0
+    coder1_positive = 0
+    coder2_positive = 0
+    for i in range(n):
+        for j in range(k):
+            a = coder1_matrix[i, j]
+            b = coder2_matrix[i, j]
+            if a == b:
+                agreements += 1
+            if a:
+                coder1_positive += 1
+            if b:
+                coder2_positive += 1
+    return agreements, coder1_positive, coder2_positive
+
+
+_kappa_counts = njit(cache=True)(_kappa_counts_loop) if njit is not None else _kappa_counts_numpy
+
+
 def calculate_cohens_kappa(
     coder1_results: List[CodingResult],
     coder2_results: List[CodingResult],
@@ -357,34 +472,27 @@ def calculate_cohens_kappa(
     coder2_map = {r.response_id: set(r.assigned_codes) for r in coder2_results}
     
     common_ids = set(coder1_map.keys()) & set(coder2_map.keys())
-    if not common_ids:
-        return 0.0
-    
-    agreements = 0
-    total_decisions = 0
-    
-    for response_id in common_ids:
-        codes1 = coder1_map[response_id]
-        codes2 = coder2_map[response_id]
-        
-        for code in codes:
-            in_coder1 = code in codes1
-            in_coder2 = code in codes2
-            if in_coder1 == in_coder2:
-                agreements += 1
-            total_decisions += 1
-    
-    if total_decisions == 0:
+    if not common_ids or not codes:
         return 0.0
     
+    # One boolean row per response, one column per code: kappa's proportions
+    # are then plain array means
+    code_positions: Dict[str, List[int]] = {}
+    for k, code in enumerate(codes):
+        code_positions.setdefault(code, []).append(k)
+    
+    coder1_matrix = np.zeros((len(common_ids), len(codes)), dtype=bool)
+    coder2_matrix = np.zeros((len(common_ids), len(codes)), dtype=bool)
+    for i, response_id in enumerate(common_ids):
+        for matrix, code_map in ((coder1_matrix, coder1_map), (coder2_matrix, coder2_map)):
+            positions = [k for c in code_map[response_id] for k in code_positions.get(c, ())]
+            matrix[i, positions] = True
+    
+    agreements, coder1_positive, coder2_positive = _kappa_counts(coder1_matrix, coder2_matrix)
+    total_decisions = coder1_matrix.size
     p_o = agreements / total_decisions
-    
-    coder1_positive = sum(1 for rid in common_ids for c in codes if c in coder1_map[rid])
-    coder2_positive = sum(1 for rid in common_ids for c in codes if c in coder2_map[rid])
-    total_possible = len(common_ids) * len(codes)
-    
-    p1_pos = coder1_positive / total_possible if total_possible > 0 else 0
-    p2_pos = coder2_positive / total_possible if total_possible > 0 else 0
+    p1_pos = coder1_positive / total_decisions
+    p2_pos = coder2_positive / total_decisions
     
     p_e = (p1_pos * p2_pos) + ((1 - p1_pos) * (1 - p2_pos))
     
@@ -433,26 +541,22 @@ def generate_frequency_table(
     Returns:
         DataFrame with code frequencies.
     """
-    code_counts = Counter()
-    for result in coding_results:
-        for code_id in result.assigned_codes:
-            code_counts[code_id] += 1
+    code_counts = Counter(chain.from_iterable(r.assigned_codes for r in coding_results))
     
     total_responses = len(coding_results)
     
-    rows = []
-    for code_id, code in codebook.codes.items():
-        count = code_counts.get(code_id, 0)
-        percentage = (count / total_responses * 100) if total_responses > 0 else 0
-        rows.append({
+    rows = [
+        {
             'Code ID': code_id,
             'Code Name': code.name,
             'Definition': code.definition[:100],
-            'Frequency': count,
-            'Percentage': round(percentage, 1)
-        })
+            'Frequency': code_counts[code_id],
+            'Percentage': round(code_counts[code_id] / total_responses * 100, 1) if total_responses > 0 else 0
+        }
+        for code_id, code in codebook.codes.items()
+    ]
     
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame.from_records(rows)
     df = df.sort_values('Frequency', ascending=False)
     return df
 
@@ -463,6 +567,9 @@ def generate_cooccurrence_matrix(
 ) -> pd.DataFrame:
     """
     Generate code co-occurrence matrix.
+    Cell (a, b) counts the responses assigned both codes; the diagonal is
+    the number of responses assigned each code (a code repeated within one
+    response counts once).
     
     Args:
         coding_results: List of coding results.
@@ -471,18 +578,44 @@ def generate_cooccurrence_matrix(
     Returns:
         DataFrame with co-occurrence counts.
     """
-    matrix = {c1: {c2: 0 for c2 in codes} for c1 in codes}
-    
-    for result in coding_results:
-        assigned = result.assigned_codes
-        for i, code1 in enumerate(assigned):
-            for code2 in assigned[i:]:
-                if code1 in matrix and code2 in matrix[code1]:
-                    matrix[code1][code2] += 1
-                    if code1 != code2:
-                        matrix[code2][code1] += 1
-    
-    return pd.DataFrame(matrix)
+    codes = list(dict.fromkeys(codes))
+    code_idx = {code: j for j, code in enumerate(codes)}
+    
+    # Response x code indicator matrix; its Gram matrix counts, for every pair
+    # of codes, the responses assigned both (the diagonal is each code's
+    # count). Float so the product goes through BLAS; counts stay exact.
+    rows, cols = [], []
+    for i, result in enumerate(coding_results):
+        for code in result.assigned_codes:
+            j = code_idx.get(code)
+            if j is not None:
+                rows.append(i)
+                cols.append(j)
+    indicators = np.zeros((len(coding_results), len(codes)))
+    indicators[rows, cols] = 1
+    
+    counts = (indicators.T @ indicators).astype(np.int64)
+    return pd.DataFrame(counts, index=codes, columns=codes)
+
+
+def _write_rows(
+    ws: Union[Worksheet, WriteOnlyWorksheet],
+    rows: List[List[Any]],
+    start_row: int
+) -> int:
+    """
+    Write rows starting at start_row and return the row after the last one.
+    Regular sheets are written in place, so re-running a task over an
+    existing sheet overwrites it; write-only sheets can only append.
+    """
+    if isinstance(ws, WriteOnlyWorksheet):
+        for values in rows:
+            ws.append(values)
+    else:
+        for row, values in enumerate(rows, start_row):
+            for col, value in enumerate(values, 1):
+                ws.cell(row=row, column=col, value=value)
+    return start_row + len(rows)
 
 
 def write_codebook_to_excel(
@@ -501,83 +634,79 @@ def write_codebook_to_excel(
     Returns:
         Next available row.
     """
-    ws = worksheet
-    row = start_row
-    
-    ws.cell(row=row, column=1, value=f"CODEBOOK: {codebook.name}")
-    row += 2
-    
-    headers = ["Code ID", "Code Name", "Definition", "Examples", "Parent Code", "Theme"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=row, column=col, value=header)
-    row += 1
-    
     code_to_theme = {}
     for theme_id, theme in codebook.themes.items():
         for code_id in theme.codes:
             code_to_theme[code_id] = theme.name
     
-    for code_id, code in codebook.codes.items():
-        ws.cell(row=row, column=1, value=code.id)
-        ws.cell(row=row, column=2, value=code.name)
-        ws.cell(row=row, column=3, value=code.definition)
-        ws.cell(row=row, column=4, value="; ".join(code.examples[:3]))
-        ws.cell(row=row, column=5, value=code.parent_code or "")
-        ws.cell(row=row, column=6, value=code_to_theme.get(code_id, ""))
-        row += 1
-    
-    row += 2
-    ws.cell(row=row, column=1, value="THEMES")
-    row += 1
-    
-    theme_headers = ["Theme ID", "Theme Name", "Description", "Number of Codes"]
-    for col, header in enumerate(theme_headers, 1):
-        ws.cell(row=row, column=col, value=header)
-    row += 1
-    
-    for theme_id, theme in codebook.themes.items():
-        ws.cell(row=row, column=1, value=theme.id)
-        ws.cell(row=row, column=2, value=theme.name)
-        ws.cell(row=row, column=3, value=theme.description)
-        ws.cell(row=row, column=4, value=len(theme.codes))
-        row += 1
-    
-    return row + 1
+    rows: List[List[Any]] = [
+        [f"CODEBOOK: {codebook.name}"],
+        [],
+        ["Code ID", "Code Name", "Definition", "Examples", "Parent Code", "Theme"],
+    ]
+    rows.extend(
+        [
+            code.id,
+            code.name,
+            code.definition,
+            "; ".join(code.examples[:3]),
+            code.parent_code or "",
+            code_to_theme.get(code_id, "")
+        ]
+        for code_id, code in codebook.codes.items()
+    )
+    
+    rows.extend([
+        [],
+        [],
+        ["THEMES"],
+        ["Theme ID", "Theme Name", "Description", "Number of Codes"],
+    ])
+    rows.extend(
+        [theme.id, theme.name, theme.description, len(theme.codes)]
+        for theme in codebook.themes.values()
+    )
+    
+    return _write_rows(worksheet, rows, start_row) + 1
 
 
 def write_coding_results_to_excel(
     results: List[CodingResult],
-    worksheet: Worksheet,
+    worksheet: Union[Worksheet, WriteOnlyWorksheet],
     start_row: int = 1
-) -> int:
+) -> Optional[int]:
     """
     Write coding results to Excel.
     
+    For large result sets (more than ~1000 rows) pass a sheet from
+    Workbook(write_only=True): rows are then streamed to disk rather than
+    kept as Cell objects. start_row is ignored in that case; anything
+    above the table must already have been appended.
+    
     Args:
         results: Coding results to write.
-        worksheet: Target worksheet.
+        worksheet: Target worksheet (regular or write-only).
         start_row: Starting row.
     
     Returns:
-        Next available row.
+        Next available row, or None for a write-only worksheet.
     """
-    ws = worksheet
-    row = start_row
-    
-    headers = ["Response ID", "Response Text", "Assigned Codes", "Coder", "Confidence"]
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=row, column=col, value=header)
-    row += 1
-    
-    for result in results:
-        ws.cell(row=row, column=1, value=result.response_id)
-        ws.cell(row=row, column=2, value=result.response_text[:200])
-        ws.cell(row=row, column=3, value=", ".join(result.assigned_codes))
-        ws.cell(row=row, column=4, value=result.coder_id)
-        ws.cell(row=row, column=5, value=round(result.confidence, 2))
-        row += 1
-    
-    return row + 1
+    rows: List[List[Any]] = [["Response ID", "Response Text", "Assigned Codes", "Coder", "Confidence"]]
+    rows.extend(
+        [
+            result.response_id,
+            result.response_text[:200],
+            ", ".join(result.assigned_codes),
+            result.coder_id,
+            round(result.confidence, 2)
+        ]
+        for result in results
+    )
+    
+    next_row = _write_rows(worksheet, rows, start_row)
+    if isinstance(worksheet, WriteOnlyWorksheet):
+        return None
+    return next_row + 1
 
 
 def create_default_codebook_from_responses(
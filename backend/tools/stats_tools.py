@@ -20,57 +20,77 @@ class SurveyDataAnalyzer:
         self.n_rows = len(df)
         self.n_cols = len(df.columns)
         self.columns = list(df.columns)
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._data_summary: Optional[str] = None
     
-    def get_column_types(self) -> Dict[str, str]:
-        """Classify each column by type."""
+    def _precompute(self) -> Dict[str, Any]:
+        """
+        Derive all column metadata in one pass and cache it.
+        Dtypes, unique counts and missing counts are each computed once
+        for the whole frame instead of once per getter call.
+        """
+        if self._metadata is not None:
+            return self._metadata
+        
+        dtypes = self.df.dtypes
+        n_unique = self.df.nunique()
+        n_missing = self.df.isna().sum()
+        
         types = {}
-        for col in self.columns:
-            dtype = str(self.df[col].dtype)
-            n_unique = self.df[col].nunique()
+        for col, dtype in dtypes.items():
+            dtype_name = str(dtype)
+            unique = n_unique[col]
             
-            if dtype in ['int64', 'float64']:
-                if n_unique <= 7:
-                    types[col] = "ordinal"
-                else:
-                    types[col] = "numeric"
-            elif dtype == 'object':
-                if n_unique <= 10:
-                    types[col] = "categorical"
-                else:
-                    types[col] = "text"
+            if dtype_name in ['int64', 'float64']:
+                types[col] = "ordinal" if unique <= 7 else "numeric"
+            elif dtype_name == 'object':
+                types[col] = "categorical" if unique <= 10 else "text"
             else:
                 types[col] = "other"
         
-        return types
+        scales = {}
+        pattern = re.compile(r'^([A-Za-z_]+)(\d+)$')
+        for col in self.columns:
+            match = pattern.match(str(col))
+            if match:
+                scales.setdefault(match.group(1), []).append(col)
+        
+        self._metadata = {
+            "types": types,
+            "numeric": list(self.df.select_dtypes(include=[np.number]).columns),
+            "categorical": list(self.df.select_dtypes(include=['object', 'category']).columns),
+            "scales": {k: sorted(v) for k, v in scales.items() if len(v) >= 2},
+            "n_unique": n_unique,
+            "n_missing": n_missing,
+        }
+        return self._metadata
+    
+    def get_column_types(self) -> Dict[str, str]:
+        """Classify each column by type."""
+        return dict(self._precompute()["types"])
     
     def get_numeric_columns(self) -> List[str]:
         """Get list of numeric columns."""
-        return list(self.df.select_dtypes(include=[np.number]).columns)
+        return list(self._precompute()["numeric"])
     
     def get_categorical_columns(self) -> List[str]:
         """Get list of categorical columns."""
-        return list(self.df.select_dtypes(include=['object', 'category']).columns)
+        return list(self._precompute()["categorical"])
     
     def detect_scales(self) -> Dict[str, List[str]]:
         """
         Detect scale patterns from column naming.
         E.g., Faith1, Faith2, Faith3 -> Faith scale
         """
-        scales = {}
-        pattern = re.compile(r'^([A-Za-z_]+)(\d+)$')
-        
-        for col in self.columns:
-            match = pattern.match(str(col))
-            if match:
-                scale_name = match.group(1)
-                if scale_name not in scales:
-                    scales[scale_name] = []
-                scales[scale_name].append(col)
-        
-        return {k: sorted(v) for k, v in scales.items() if len(v) >= 2}
+        return {k: list(v) for k, v in self._precompute()["scales"].items()}
     
     def create_data_summary(self) -> str:
         """Create comprehensive data summary for strategist."""
+        if self._data_summary is not None:
+            return self._data_summary
+        
+        metadata = self._precompute()
+        total_missing = metadata["n_missing"].sum()
         lines = [
             "=" * 60,
             "SURVEY DATA SUMMARY",
@@ -82,17 +102,17 @@ class SurveyDataAnalyzer:
             f"  Total cells: {self.n_rows * self.n_cols}",
             "",
             f"MISSING DATA:",
-            f"  Total missing: {self.df.isna().sum().sum()}",
-            f"  Missing %: {self.df.isna().sum().sum() / (self.n_rows * self.n_cols) * 100:.1f}%",
+            f"  Total missing: {total_missing}",
+            f"  Missing %: {total_missing / (self.n_rows * self.n_cols) * 100:.1f}%",
             "",
             "COLUMN DETAILS:",
         ]
         
-        col_types = self.get_column_types()
+        col_types = metadata["types"]
         for col in self.columns:
             dtype = col_types.get(col, "unknown")
-            n_missing = self.df[col].isna().sum()
-            n_unique = self.df[col].nunique()
+            n_missing = metadata["n_missing"][col]
+            n_unique = metadata["n_unique"][col]
             
             info = f"  - {col}: {dtype}, {n_unique} unique, {n_missing} missing"
             
@@ -103,7 +123,7 @@ class SurveyDataAnalyzer:
             
             lines.append(info)
         
-        scales = self.detect_scales()
+        scales = metadata["scales"]
         if scales:
             lines.extend([
                 "",
@@ -112,16 +132,19 @@ class SurveyDataAnalyzer:
             for name, items in scales.items():
                 lines.append(f"  - {name}: {len(items)} items ({', '.join(items[:3])}{'...' if len(items) > 3 else ''})")
         
+        numeric_cols = metadata["numeric"]
+        categorical_cols = metadata["categorical"]
         lines.extend([
             "",
             "NUMERIC COLUMNS FOR ANALYSIS:",
-            f"  {', '.join(self.get_numeric_columns()[:10])}{'...' if len(self.get_numeric_columns()) > 10 else ''}",
+            f"  {', '.join(numeric_cols[:10])}{'...' if len(numeric_cols) > 10 else ''}",
             "",
             "CATEGORICAL COLUMNS:",
-            f"  {', '.join(self.get_categorical_columns()[:5])}{'...' if len(self.get_categorical_columns()) > 5 else ''}",
+            f"  {', '.join(categorical_cols[:5])}{'...' if len(categorical_cols) > 5 else ''}",
         ])
         
-        return "\n".join(lines)
+        self._data_summary = "\n".join(lines)
+        return self._data_summary
     
     def calculate_descriptives(self, col: str) -> Dict[str, Any]:
         """Calculate descriptive statistics for a column."""
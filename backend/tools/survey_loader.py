@@ -0,0 +1,72 @@
+"""
+Survey file loading.
+Parses uploaded survey workbooks into DataFrames, caching each parse as a
+parquet sidecar next to the source so repeated workflow runs skip
+pd.read_excel.
+"""
+
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+try:
+    import pyarrow  # type: ignore  # noqa: F401
+except Exception:
+    pyarrow = None
+
+
+def _sidecar_path(file_path: Path) -> Path:
+    """Parquet cache path keyed on the source file's mtime and size."""
+    stat = file_path.stat()
+    return file_path.with_suffix(f".{stat.st_mtime_ns}_{stat.st_size}.parquet")
+
+
+def _stale_sidecars(file_path: Path, keep: Path) -> Iterator[Path]:
+    """Yield cache files left by earlier versions of file_path."""
+    pattern = re.compile(rf"{re.escape(file_path.stem)}\.\d+_\d+\.parquet")
+    for path in file_path.parent.glob(f"{file_path.stem}.*.parquet"):
+        if path != keep and pattern.fullmatch(path.name):
+            yield path
+
+
+def load_survey_dataframe(file_path: Path) -> pd.DataFrame:
+    """
+    Load a survey Excel file, reusing a parquet sidecar when the source is unchanged.
+
+    The sidecar is keyed on the file's mtime and size, so any edit to the
+    workbook forces a fresh parse; sidecars from earlier versions are removed
+    when the new one is written. The parquet file is written to a temporary
+    name and renamed into place, so concurrent readers never see a partial
+    file. Without pyarrow, or if the frame cannot be stored as parquet, this
+    is a plain pd.read_excel.
+    """
+    file_path = Path(file_path)
+    if pyarrow is None:
+        return pd.read_excel(file_path)
+
+    cache_path = _sidecar_path(file_path)
+    if cache_path.exists():
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception:
+            pass
+
+    df = pd.read_excel(file_path)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{cache_path.name}.", suffix=".tmp", dir=cache_path.parent
+    )
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_name)
+        os.replace(tmp_name, cache_path)
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        return df
+
+    for stale in _stale_sidecars(file_path, cache_path):
+        stale.unlink(missing_ok=True)
+    return df
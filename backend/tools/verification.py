@@ -17,6 +17,11 @@ from openpyxl import load_workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.utils import get_column_letter
 
+try:
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None
+
 
 class VerificationStatus(str, Enum):
     """Verification result status."""
@@ -26,7 +31,7 @@ class VerificationStatus(str, Enum):
     ERROR = "ERROR"
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationCheck:
     """Single verification check result."""
     check_name: str
@@ -53,7 +58,7 @@ class VerificationCheck:
         return diff <= self.tolerance
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """Complete verification result for a task or sheet."""
     task_id: str
@@ -91,6 +96,38 @@ PERCENTAGE_TOLERANCE = 0.01
 STATISTICAL_TOLERANCE = 1e-4
 
 
+def _scale_variances_numpy(items: np.ndarray) -> Tuple[float, float]:
+    """Sum of item variances and variance of row totals (ddof=1) for an N x k matrix."""
+    return float(items.var(axis=0, ddof=1).sum()), float(items.sum(axis=1).var(ddof=1))
+
+
+def _scale_variances_loop(items):
+    """Loop form of _scale_variances_numpy, compiled with numba when available."""
+    n, k = items.shape
+    totals = np.zeros(n)
+    item_var_sum = 0.0
+    for j in range(k):
+        mean = 0.0
+        for i in range(n):
+            mean += items[i, j]
+            totals[i] += items[i, j]
+        mean /= n
+        ss = 0.0
+        for i in range(n):
+            d = items[i, j] - mean
+            ss += d * d
+        item_var_sum += ss / (n - 1)
+    total_mean = totals.mean()
+    ss = 0.0
+    for i in range(n):
+        d = totals[i] - total_mean
+        ss += d * d
+    return item_var_sum, ss / (n - 1)
+
+
+_scale_variances = njit(cache=True)(_scale_variances_loop) if njit is not None else _scale_variances_numpy
+
+
 class StatisticalVerifier:
     """
     Computes ground-truth statistics for verification.
@@ -105,6 +142,21 @@ class StatisticalVerifier:
             data: DataFrame with raw survey data.
         """
         self.data = data
+        self._num: Dict[str, np.ndarray] = {}
+        self._valid_mask: Dict[str, np.ndarray] = {}
+        for column in data.select_dtypes(include=np.number).columns:
+            values = np.ascontiguousarray(
+                data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            )
+            self._num[column] = values
+            self._valid_mask[column] = ~np.isnan(values)
+
+    def _column(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Float64 values and non-missing mask for a column (cached for numeric columns)."""
+        if column not in self._num:
+            values = self.data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            return values, ~np.isnan(values)
+        return self._num[column], self._valid_mask[column]
 
     def compute_descriptives(self, column: str) -> Dict[str, float]:
         """
@@ -116,9 +168,12 @@ class StatisticalVerifier:
         Returns:
             Dict with count, mean, std, min, max, skew, kurtosis.
         """
-        series = self.data[column].dropna()
+        values, mask = self._column(column)
+        valid = values[mask]
+        count = len(valid)
+        missing = len(values) - count
 
-        if len(series) == 0:
+        if count == 0:
             return {
                 "count": 0,
                 "mean": float('nan'),
@@ -129,20 +184,38 @@ class StatisticalVerifier:
                 "kurtosis": float('nan'),
                 "median": float('nan'),
                 "variance": float('nan'),
-                "missing": len(self.data[column]) - len(series)
+                "missing": missing
+            }
+
+        if count == 1:
+            value = float(valid[0])
+            return {
+                "count": 1,
+                "mean": value,
+                "std": float('nan'),
+                "min": value,
+                "max": value,
+                "skewness": float('nan'),
+                "kurtosis": float('nan'),
+                "median": value,
+                "variance": float('nan'),
+                "missing": missing
             }
 
+        # One pass for min/max and the first four moments (ddof=1 variance,
+        # bias-corrected skew and excess kurtosis, as Excel's SKEW/KURT)
+        desc = stats.describe(valid, ddof=1, bias=False)
         return {
-            "count": len(series),
-            "mean": series.mean(),
-            "std": series.std(ddof=1),
-            "min": series.min(),
-            "max": series.max(),
-            "skewness": stats.skew(series, bias=False) if len(series) >= 3 else float('nan'),
-            "kurtosis": stats.kurtosis(series, bias=False) if len(series) >= 4 else float('nan'),
-            "median": series.median(),
-            "variance": series.var(ddof=1),
-            "missing": len(self.data[column]) - len(series)
+            "count": count,
+            "mean": desc.mean,
+            "std": math.sqrt(desc.variance),
+            "min": desc.minmax[0],
+            "max": desc.minmax[1],
+            "skewness": desc.skewness if count >= 3 else float('nan'),
+            "kurtosis": desc.kurtosis if count >= 4 else float('nan'),
+            "median": float(np.median(valid)),
+            "variance": desc.variance,
+            "missing": missing
         }
 
     def compute_correlation(self, col1: str, col2: str) -> float:
@@ -156,10 +229,15 @@ class StatisticalVerifier:
         Returns:
             Correlation coefficient.
         """
-        valid = self.data[[col1, col2]].dropna()
-        if len(valid) < 3:
+        x, x_mask = self._column(col1)
+        y, y_mask = self._column(col2)
+        both = x_mask & y_mask
+        if both.sum() < 3:
+            return float('nan')
+        x, y = x[both], y[both]
+        if x.std() == 0 or y.std() == 0:
             return float('nan')
-        return valid[col1].corr(valid[col2])
+        return float(np.corrcoef(x, y)[0, 1])
 
     def compute_ttest(
         self,
@@ -218,13 +296,14 @@ class StatisticalVerifier:
             return float('nan')
 
         k = len(columns)
-        item_variances = subset.var(ddof=1)
-        total_variance = subset.sum(axis=1).var(ddof=1)
+        item_variance_sum, total_variance = _scale_variances(
+            subset.to_numpy(dtype=np.float64)
+        )
 
         if total_variance == 0:
             return 0.0
 
-        alpha = (k / (k - 1)) * (1 - item_variances.sum() / total_variance)
+        alpha = (k / (k - 1)) * (1 - item_variance_sum / total_variance)
         return alpha
 
     def compute_shapiro_wilk(self, column: str) -> Tuple[float, float]:
@@ -237,11 +316,12 @@ class StatisticalVerifier:
         Returns:
             Tuple of (W statistic, p-value).
         """
-        series = self.data[column].dropna()
-        if len(series) < 3 or len(series) > 5000:
+        values, mask = self._column(column)
+        valid = values[mask]
+        if len(valid) < 3 or len(valid) > 5000:
             return (float('nan'), float('nan'))
 
-        result = stats.shapiro(series)
+        result = stats.shapiro(valid)
         return (result.statistic, result.pvalue)
 
     def compute_levene(self, *groups: pd.Series) -> Tuple[float, float]:
@@ -312,17 +392,42 @@ class ExcelVerifier:
         self.workbook_path = workbook_path
         self.raw_data = raw_data
         self.stats = StatisticalVerifier(raw_data)
+        self._evaluator: Optional[FormulaEvaluator] = None
 
         if REQUIRE_EXCEL_RECALC:
-            recalculate_workbook(workbook_path)
+            if ExcelCompiler is not None:
+                self._evaluator = FormulaEvaluator(workbook_path)
+            else:
+                recalculate_workbook(workbook_path)
+
+        self.workbook = self._load_values()
 
-        keep_vba = workbook_path.suffix.lower() == '.xlsm'
-        self.workbook = load_workbook(
-            workbook_path,
+    def _load_values(self):
+        keep_vba = self.workbook_path.suffix.lower() == '.xlsm'
+        return load_workbook(
+            self.workbook_path,
             data_only=True,
             keep_vba=keep_vba
         )
 
+    def _cell_value(self, sheet_name: str, cell_ref: str) -> Any:
+        """
+        Read a computed cell value.
+
+        Formulas are evaluated in Python when pycel is available; the first
+        unsupported formula (e.g. a VBA UDF) triggers one Excel recalculation
+        and all later reads use the values Excel cached.
+        """
+        if self._evaluator is not None:
+            try:
+                return self._evaluator.evaluate(sheet_name, cell_ref)
+            except UnsupportedFormulaError:
+                self._evaluator = None
+                self.workbook.close()
+                recalculate_workbook(self.workbook_path)
+                self.workbook = self._load_values()
+        return self.workbook[sheet_name][cell_ref].value
+
     def close(self) -> None:
         """Close workbook."""
         if self.workbook:
@@ -374,7 +479,8 @@ class ExcelVerifier:
         self,
         sheet_name: str,
         column_name: str,
-        cell_map: Dict[str, str]
+        cell_map: Dict[str, str],
+        expected: Optional[Dict[str, float]] = None
     ) -> List[VerificationCheck]:
         """
         Verify descriptive statistics.
@@ -383,6 +489,7 @@ class ExcelVerifier:
             sheet_name: Sheet containing results.
             column_name: Column that was analyzed.
             cell_map: Map of stat names to cell references.
+            expected: Precomputed compute_descriptives() output, if available.
 
         Returns:
             List of verification checks.
@@ -398,8 +505,8 @@ class ExcelVerifier:
                 details="Sheet not found"
             )]
 
-        ws = self.workbook[sheet_name]
-        expected = self.stats.compute_descriptives(column_name)
+        if expected is None:
+            expected = self.stats.compute_descriptives(column_name)
         checks = []
 
         stat_tolerances = {
@@ -420,7 +527,7 @@ class ExcelVerifier:
                 continue
 
             exp_val = expected[stat_name]
-            actual_val = ws[cell_ref].value
+            actual_val = self._cell_value(sheet_name, cell_ref)
             tolerance = stat_tolerances.get(stat_name, DEFAULT_TOLERANCE)
 
             if actual_val is None:
@@ -483,19 +590,23 @@ class ExcelVerifier:
                 details=f"Sheet {sheet_name} not found"
             )]
 
-        ws = self.workbook[sheet_name]
         checks = []
+        expected = {
+            (col1, col2): self.stats.compute_correlation(col1, col2)
+            for i, col1 in enumerate(columns)
+            for col2 in columns[i + 1:]
+        }
 
         for i, col1 in enumerate(columns):
             for j, col2 in enumerate(columns):
                 if j <= i:
                     continue
 
-                exp_corr = self.stats.compute_correlation(col1, col2)
+                exp_corr = expected[(col1, col2)]
                 cell_row = start_row + i
                 cell_col = start_col + j
                 cell_ref = f"{get_column_letter(cell_col)}{cell_row}"
-                actual_val = ws.cell(row=cell_row, column=cell_col).value
+                actual_val = self._cell_value(sheet_name, cell_ref)
 
                 if math.isnan(exp_corr):
                     status = VerificationStatus.SKIP
@@ -558,11 +669,12 @@ def verify_task_output(
         if task_type == "descriptive_stats":
             columns = verification_config.get("columns", [])
             cell_maps = verification_config.get("cell_maps", {})
+            columns = [col for col in columns if col in cell_maps]
+            expected = {col: verifier.stats.compute_descriptives(col) for col in columns}
             for col in columns:
-                if col in cell_maps:
-                    checks.extend(verifier.verify_descriptives(
-                        sheet_name, col, cell_maps[col]
-                    ))
+                checks.extend(verifier.verify_descriptives(
+                    sheet_name, col, cell_maps[col], expected[col]
+                ))
 
         elif task_type == "correlation_matrix":
             columns = verification_config.get("columns", [])
@@ -647,3 +759,4 @@ def generate_verification_report(results: List[VerificationResult]) -> str:
     return "\n".join(lines)
 from config import REQUIRE_EXCEL_RECALC
 from tools.excel_com import recalculate_workbook
+from tools.formula_eval import ExcelCompiler, FormulaEvaluator, UnsupportedFormulaError